@@ -48,7 +48,7 @@ const Products = () => {
 
     try {
       const response = await productsAPI.search(searchQuery);
-      setProducts(response.data || []);
+      setProducts((response.data?.data || []).map((hit) => hit.item));
     } catch (error) {
       toast.error('Search failed');
       console.error(error);
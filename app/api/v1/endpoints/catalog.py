@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+
+from app.db.weaviate_client import get_async_weaviate_client
+from app.models.catalog import CatalogTree
+from app.services.catalog_service import CatalogService
+
+router = APIRouter()
+
+
+def get_service(client=Depends(get_async_weaviate_client)):
+    return CatalogService(client)
+
+
+@router.get("/tree", response_model=CatalogTree, tags=["Catalog"])
+async def get_catalog_tree(
+    include_inactive: bool = False,
+    service: CatalogService = Depends(get_service),
+):
+    """Get the sorted section/category hierarchy with breadcrumb paths"""
+    return await service.get_tree(include_inactive)
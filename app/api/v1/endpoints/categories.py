@@ -2,7 +2,7 @@ import math
 
 from fastapi import APIRouter, Depends, Query, status
 
-from app.db.weaviate_client import get_weaviate_client
+from app.db.weaviate_client import get_async_weaviate_client
 from app.models.category import Category, CategoryCreate, CategoryUpdate
 from app.models.common import MessageResponse, PaginatedResponse
 from app.services.category_service import CategoryService
@@ -10,7 +10,7 @@ from app.services.category_service import CategoryService
 router = APIRouter()
 
 
-def get_service(client=Depends(get_weaviate_client)):
+def get_service(client=Depends(get_async_weaviate_client)):
     return CategoryService(client)
 
 
@@ -20,7 +20,7 @@ async def create_category(
     service: CategoryService = Depends(get_service),
 ):
     """Create a new category"""
-    return service.create_category(category)
+    return await service.create_category(category)
 
 
 @router.get("", response_model=PaginatedResponse[Category], tags=["Admin - Categories"])
@@ -31,7 +31,7 @@ async def list_categories(
     service: CategoryService = Depends(get_service),
 ):
     """List all categories with pagination"""
-    categories, total = service.list_categories(page, page_size, parent_id)
+    categories, total = await service.list_categories(page, page_size, parent_id)
 
     return PaginatedResponse(
         total=total,
@@ -48,7 +48,7 @@ async def get_category(
     service: CategoryService = Depends(get_service),
 ):
     """Get category by ID"""
-    return service.get_category(category_id)
+    return await service.get_category(category_id)
 
 
 @router.put("/{category_id}", response_model=Category, tags=["Admin - Categories"])
@@ -58,7 +58,7 @@ async def update_category(
     service: CategoryService = Depends(get_service),
 ):
     """Update category"""
-    return service.update_category(category_id, category)
+    return await service.update_category(category_id, category)
 
 
 @router.delete("/{category_id}", response_model=MessageResponse, tags=["Admin - Categories"])
@@ -67,5 +67,5 @@ async def delete_category(
     service: CategoryService = Depends(get_service),
 ):
     """Delete category"""
-    service.delete_category(category_id)
+    await service.delete_category(category_id)
     return MessageResponse(message="Category deleted successfully", id=category_id)
@@ -1,8 +1,8 @@
 from fastapi import APIRouter
 
 from app.core.config import get_settings
-from app.db.schema import check_schema
-from app.db.weaviate_client import get_weaviate_client
+from app.db.schema import check_schema_async
+from app.db.weaviate_client import get_async_weaviate_client
 from app.models.common import HealthResponse
 
 router = APIRouter()
@@ -14,8 +14,8 @@ async def health_check():
     settings = get_settings()
 
     try:
-        client = get_weaviate_client()
-        weaviate_connected = check_schema(client)
+        client = await get_async_weaviate_client()
+        weaviate_connected = await check_schema_async(client)
     except:
         weaviate_connected = False
 
@@ -1,22 +1,31 @@
 import math
+from typing import Literal
 
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from app.db.weaviate_client import get_weaviate_client
+from app.core.config import get_settings
+from app.db.weaviate_client import get_async_weaviate_client
 from app.models.common import MessageResponse, PaginatedResponse
 from app.models.order import (
     Order,
     OrderCreate,
+    OrderPage,
     OrderStatistics,
     OrderStatus,
+    OrderStatusTransition,
+    OrderTransitionResult,
     OrderUpdate,
 )
 from app.services.order_service import OrderService
+from app.utils.feeds import EXPORT_MEDIA_TYPES, iter_export
 
 router = APIRouter()
+settings = get_settings()
 
 
-def get_service(client=Depends(get_weaviate_client)):
+def get_service(client=Depends(get_async_weaviate_client)):
     return OrderService(client)
 
 
@@ -26,33 +35,83 @@ async def create_order(
     service: OrderService = Depends(get_service),
 ):
     """Create a new order"""
-    return service.create_order(order)
+    return await service.create_order(order)
 
 
-@router.get("", response_model=PaginatedResponse[Order], tags=["Admin - Orders"])
+@router.get("", response_model=OrderPage, tags=["Admin - Orders"])
 async def list_orders(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     status_filter: OrderStatus | None = Query(None, alias="status"),
     customer_email: str | None = None,
+    cursor: str | None = None,
+    fields: str | None = None,
     service: OrderService = Depends(get_service),
 ):
-    """List all orders with pagination and filters"""
-    orders, total = service.list_orders(page, page_size, status_filter, customer_email)
+    """List all orders with pagination and filters
 
-    return PaginatedResponse(
+    Pass the returned next_cursor as cursor to fetch the following page at constant cost.
+    Pass fields=grid, or a comma-separated field list, to return only those fields.
+    """
+    orders, total, next_cursor = await service.list_orders(
+        page, page_size, status_filter, customer_email, cursor, fields,
+    )
+
+    response = PaginatedResponse(
         total=total,
         page=page,
         page_size=page_size,
         total_pages=math.ceil(total / page_size) if total > 0 else 0,
         data=orders,
+        next_cursor=next_cursor,
+    )
+    if fields:
+        # Projected rows carry only the requested fields, so skip full-model validation
+        return JSONResponse(jsonable_encoder(response))
+    return response
+
+
+@router.get("/export", response_class=StreamingResponse, tags=["Admin - Orders"])
+async def export_orders(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    service: OrderService = Depends(get_service),
+):
+    """Stream all orders as NDJSON or CSV"""
+    return StreamingResponse(
+        iter_export(
+            service.export_orders(page_size=settings.EXPORT_PAGE_SIZE),
+            export_format,
+            fieldnames=list(Order.model_fields),
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="orders.{export_format}"'},
+    )
+
+
+@router.post("/bulk-status", response_model=OrderTransitionResult, tags=["Admin - Orders"])
+async def transition_orders(
+    transition: OrderStatusTransition,
+    batch_size: int = Query(settings.BULK_BATCH_SIZE, ge=1, le=1000),
+    service: OrderService = Depends(get_service),
+):
+    """Move many orders, given by ID or order number, to a new status
+
+    Allowed changes: pending to processing or cancelled, processing to shipped or
+    cancelled, shipped to delivered. Every order gets its own result entry.
+    """
+    return await service.transition_orders(
+        transition.status,
+        ids=transition.ids,
+        order_numbers=transition.order_numbers,
+        notes=transition.notes,
+        batch_size=batch_size,
     )
 
 
 @router.get("/statistics", response_model=OrderStatistics, tags=["Admin - Orders"])
 async def get_order_statistics(service: OrderService = Depends(get_service)):
     """Get order statistics"""
-    return service.get_statistics()
+    return await service.get_statistics()
 
 
 @router.get("/number/{order_number}", response_model=Order, tags=["Admin - Orders"])
@@ -61,7 +120,7 @@ async def get_order_by_number(
     service: OrderService = Depends(get_service),
 ):
     """Get order by order number"""
-    return service.get_order_by_number(order_number)
+    return await service.get_order_by_number(order_number)
 
 
 @router.get("/{order_id}", response_model=Order, tags=["Admin - Orders"])
@@ -70,7 +129,7 @@ async def get_order(
     service: OrderService = Depends(get_service),
 ):
     """Get order by ID"""
-    return service.get_order(order_id)
+    return await service.get_order(order_id)
 
 
 @router.put("/{order_id}", response_model=Order, tags=["Admin - Orders"])
@@ -80,7 +139,7 @@ async def update_order(
     service: OrderService = Depends(get_service),
 ):
     """Update order"""
-    return service.update_order(order_id, order)
+    return await service.update_order(order_id, order)
 
 
 @router.delete("/{order_id}", response_model=MessageResponse, tags=["Admin - Orders"])
@@ -89,5 +148,5 @@ async def delete_order(
     service: OrderService = Depends(get_service),
 ):
     """Delete order"""
-    service.delete_order(order_id)
+    await service.delete_order(order_id)
     return MessageResponse(message="Order deleted successfully", id=order_id)
@@ -1,16 +1,41 @@
 import math
+from typing import Literal
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from app.db.weaviate_client import get_weaviate_client
-from app.models.common import MessageResponse, PaginatedResponse
-from app.models.product import Product, ProductCreate, ProductUpdate
+from app.core.config import get_settings
+from app.core.exceptions import BadRequestException
+from app.db.weaviate_client import get_async_weaviate_client
+from app.models.common import (
+    BulkOperationResult,
+    MessageResponse,
+    PaginatedResponse,
+    SearchResponse,
+)
+from app.models.product import (
+    Product,
+    ProductBatch,
+    ProductBatchGet,
+    ProductBulkUpdate,
+    ProductCreate,
+    ProductFilterUpdate,
+    ProductImportResult,
+    ProductPage,
+    ProductSearchResponse,
+    ProductSelector,
+    ProductSuggestion,
+    ProductUpdate,
+)
 from app.services.product_service import ProductService
+from app.utils.feeds import EXPORT_MEDIA_TYPES, detect_format, iter_export, iter_records
 
 router = APIRouter()
+settings = get_settings()
 
 
-def get_service(client=Depends(get_weaviate_client)):
+def get_service(client=Depends(get_async_weaviate_client)):
     return ProductService(client)
 
 
@@ -20,10 +45,86 @@ async def create_product(
     service: ProductService = Depends(get_service),
 ):
     """Create a new product"""
-    return service.create_product(product)
+    return await service.create_product(product)
 
 
-@router.get("", response_model=PaginatedResponse[Product], tags=["Admin - Products"])
+@router.post("/bulk", response_model=ProductImportResult, tags=["Admin - Products"])
+async def bulk_import_products(
+    request: Request,
+    feed_format: Literal["json", "ndjson", "csv"] | None = Query(None, alias="format"),
+    batch_size: int = Query(settings.BULK_BATCH_SIZE, ge=1, le=1000),
+    concurrency: int = Query(settings.BULK_CONCURRENCY, ge=1, le=32),
+    service: ProductService = Depends(get_service),
+):
+    """Bulk upsert products keyed by SKU from a JSON array, NDJSON or CSV body
+
+    The format is taken from the format parameter or the Content-Type header.
+    """
+    fmt = feed_format or detect_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise BadRequestException("Unknown feed format; pass format=json|ndjson|csv")
+
+    return await service.bulk_upsert_products(
+        iter_records(request.stream(), fmt),
+        batch_size=batch_size,
+        concurrency=concurrency,
+    )
+
+
+@router.post("/bulk-update", response_model=BulkOperationResult, tags=["Admin - Products"])
+async def bulk_update_products(
+    bulk: ProductBulkUpdate,
+    batch_size: int = Query(settings.BULK_BATCH_SIZE, ge=1, le=1000),
+    concurrency: int = Query(settings.BULK_CONCURRENCY, ge=1, le=32),
+    service: ProductService = Depends(get_service),
+):
+    """Patch many products, each with its own changes, in batched writes"""
+    return await service.bulk_update_products(bulk.items, batch_size=batch_size, concurrency=concurrency)
+
+
+@router.post("/bulk-update-by-filter", response_model=BulkOperationResult, tags=["Admin - Products"])
+async def update_products_by_filter(
+    bulk: ProductFilterUpdate,
+    batch_size: int = Query(settings.BULK_BATCH_SIZE, ge=1, le=1000),
+    concurrency: int = Query(settings.BULK_CONCURRENCY, ge=1, le=32),
+    service: ProductService = Depends(get_service),
+):
+    """Apply the same changes to every product matching a filter"""
+    return await service.update_products_by_filter(
+        bulk.filter, bulk.update, batch_size=batch_size, concurrency=concurrency,
+    )
+
+
+@router.post("/bulk-delete", response_model=BulkOperationResult, tags=["Admin - Products"])
+async def delete_products_by_filter(
+    selector: ProductSelector,
+    service: ProductService = Depends(get_service),
+):
+    """Delete every product matching a filter"""
+    return await service.delete_products_by_filter(selector)
+
+
+@router.post("/batch-get", response_model=ProductBatch, tags=["Admin - Products"])
+async def batch_get_products(
+    batch: ProductBatchGet,
+    fields: str | None = None,
+    service: ProductService = Depends(get_service),
+):
+    """Get up to 500 products by ID in one request
+
+    Products come back in request order; unknown or malformed IDs are listed in missing.
+    Pass fields=grid, fields=card or a comma-separated field list to return only those fields.
+    """
+    products, missing = await service.get_products_by_ids(batch.ids, fields)
+
+    # Constructed, not validated: projected rows are not complete Product models
+    response = ProductBatch.model_construct(data=products, missing=missing)
+    if fields:
+        return JSONResponse(jsonable_encoder(response))
+    return response
+
+
+@router.get("", response_model=ProductPage, tags=["Admin - Products"])
 async def list_products(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
@@ -31,30 +132,107 @@ async def list_products(
     section_id: str | None = None,
     is_active: bool | None = None,
     featured: bool | None = None,
+    cursor: str | None = None,
+    fields: str | None = None,
     service: ProductService = Depends(get_service),
 ):
-    """List all products with pagination and filters"""
-    products, total = service.list_products(
-        page, page_size, category_id, section_id, is_active, featured,
+    """List all products with pagination and filters
+
+    Pass the returned next_cursor as cursor to fetch the following page at constant cost.
+    Pass fields=grid, fields=card or a comma-separated field list to return only those fields.
+    """
+    products, total, next_cursor = await service.list_products(
+        page, page_size, category_id, section_id, is_active, featured, cursor, fields,
     )
 
-    return PaginatedResponse(
+    response = PaginatedResponse(
         total=total,
         page=page,
         page_size=page_size,
         total_pages=math.ceil(total / page_size) if total > 0 else 0,
         data=products,
+        next_cursor=next_cursor,
+    )
+    if fields:
+        # Projected rows carry only the requested fields, so skip full-model validation
+        return JSONResponse(jsonable_encoder(response))
+    return response
+
+
+@router.get("/export", response_class=StreamingResponse, tags=["Admin - Products"])
+async def export_products(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    service: ProductService = Depends(get_service),
+):
+    """Stream all products as NDJSON or CSV"""
+    return StreamingResponse(
+        iter_export(
+            service.export_products(page_size=settings.EXPORT_PAGE_SIZE),
+            export_format,
+            fieldnames=list(Product.model_fields),
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="products.{export_format}"'},
     )
 
 
-@router.get("/search", response_model=list[Product], tags=["Admin - Products"])
+@router.get("/search", response_model=ProductSearchResponse, tags=["Admin - Products"])
 async def search_products(
     q: str = Query(..., min_length=1),
     limit: int = Query(10, ge=1, le=50),
+    offset: int = Query(0, ge=0),
+    cursor: str | None = None,
+    alpha: float = Query(settings.SEARCH_ALPHA, ge=0, le=1),
+    category_id: str | None = None,
+    section_id: str | None = None,
+    is_active: bool | None = None,
+    min_price: float | None = Query(None, ge=0),
+    max_price: float | None = Query(None, ge=0),
+    fields: str | None = None,
+    service: ProductService = Depends(get_service),
+):
+    """Search products with hybrid keyword and semantic ranking
+
+    alpha=0 ranks by keywords only and alpha=1 by meaning only. Results carry their
+    relevance score; pass next_cursor as cursor for the following page.
+    Pass fields=grid, fields=card or a comma-separated field list to return only those fields.
+    """
+    hits, offset, next_cursor = await service.search_products(
+        q, limit, fields, alpha, category_id, section_id, is_active, min_price, max_price, offset, cursor,
+    )
+
+    response = SearchResponse(limit=limit, offset=offset, data=hits, next_cursor=next_cursor)
+    if fields:
+        return JSONResponse(jsonable_encoder(response))
+    return response
+
+
+@router.get("/suggest", response_model=list[ProductSuggestion], tags=["Admin - Products"])
+async def suggest_products(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+    service: ProductService = Depends(get_service),
+):
+    """Typeahead suggestions matching the start of product names, SKUs and category names"""
+    return service.suggest(prefix, limit)
+
+
+@router.get("/by-slug/{slug}", response_model=Product, tags=["Admin - Products"])
+async def get_product_by_slug(
+    slug: str,
+    service: ProductService = Depends(get_service),
+):
+    """Get product by slug"""
+    return await service.get_product_by_slug(slug)
+
+
+@router.get("/by-sku/{sku}", response_model=Product, tags=["Admin - Products"])
+async def get_product_by_sku(
+    sku: str,
     service: ProductService = Depends(get_service),
 ):
-    """Search products using semantic search"""
-    return service.search_products(q, limit)
+    """Get product by SKU"""
+    return await service.get_product_by_sku(sku)
 
 
 @router.get("/{product_id}", response_model=Product, tags=["Admin - Products"])
@@ -63,7 +241,7 @@ async def get_product(
     service: ProductService = Depends(get_service),
 ):
     """Get product by ID"""
-    return service.get_product(product_id)
+    return await service.get_product(product_id)
 
 
 @router.put("/{product_id}", response_model=Product, tags=["Admin - Products"])
@@ -73,7 +251,7 @@ async def update_product(
     service: ProductService = Depends(get_service),
 ):
     """Update product"""
-    return service.update_product(product_id, product)
+    return await service.update_product(product_id, product)
 
 
 @router.delete("/{product_id}", response_model=MessageResponse, tags=["Admin - Products"])
@@ -82,5 +260,5 @@ async def delete_product(
     service: ProductService = Depends(get_service),
 ):
     """Delete product"""
-    service.delete_product(product_id)
+    await service.delete_product(product_id)
     return MessageResponse(message="Product deleted successfully", id=product_id)
@@ -2,7 +2,7 @@ import math
 
 from fastapi import APIRouter, Depends, Query, status
 
-from app.db.weaviate_client import get_weaviate_client
+from app.db.weaviate_client import get_async_weaviate_client
 from app.models.common import MessageResponse, PaginatedResponse
 from app.models.section import Section, SectionCreate, SectionUpdate
 from app.services.section_service import SectionService
@@ -10,7 +10,7 @@ from app.services.section_service import SectionService
 router = APIRouter()
 
 
-def get_service(client=Depends(get_weaviate_client)):
+def get_service(client=Depends(get_async_weaviate_client)):
     return SectionService(client)
 
 
@@ -20,7 +20,7 @@ async def create_section(
     service: SectionService = Depends(get_service),
 ):
     """Create a new section"""
-    return service.create_section(section)
+    return await service.create_section(section)
 
 
 @router.get("", response_model=PaginatedResponse[Section], tags=["Admin - Sections"])
@@ -31,7 +31,7 @@ async def list_sections(
     service: SectionService = Depends(get_service),
 ):
     """List all sections with pagination"""
-    sections, total = service.list_sections(page, page_size, parent_id)
+    sections, total = await service.list_sections(page, page_size, parent_id)
 
     return PaginatedResponse(
         total=total,
@@ -48,7 +48,7 @@ async def get_section(
     service: SectionService = Depends(get_service),
 ):
     """Get section by ID"""
-    return service.get_section(section_id)
+    return await service.get_section(section_id)
 
 
 @router.put("/{section_id}", response_model=Section, tags=["Admin - Sections"])
@@ -58,7 +58,7 @@ async def update_section(
     service: SectionService = Depends(get_service),
 ):
     """Update section"""
-    return service.update_section(section_id, section)
+    return await service.update_section(section_id, section)
 
 
 @router.delete("/{section_id}", response_model=MessageResponse, tags=["Admin - Sections"])
@@ -67,5 +67,5 @@ async def delete_section(
     service: SectionService = Depends(get_service),
 ):
     """Delete section"""
-    service.delete_section(section_id)
+    await service.delete_section(section_id)
     return MessageResponse(message="Section deleted successfully", id=section_id)
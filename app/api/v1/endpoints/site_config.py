@@ -1,20 +1,20 @@
 from fastapi import APIRouter, Depends, status
 
-from app.db.weaviate_client import get_weaviate_client
+from app.db.weaviate_client import get_async_weaviate_client
 from app.models.site_config import SiteConfig, SiteConfigCreate, SiteConfigUpdate
 from app.services.site_config_service import SiteConfigService
 
 router = APIRouter()
 
 
-def get_service(client=Depends(get_weaviate_client)):
+def get_service(client=Depends(get_async_weaviate_client)):
     return SiteConfigService(client)
 
 
 @router.get("", response_model=SiteConfig, tags=["Admin - Site Config"])
 async def get_site_config(service: SiteConfigService = Depends(get_service)):
     """Get site configuration"""
-    return service.get_config()
+    return await service.get_config()
 
 
 @router.post("", response_model=SiteConfig, status_code=status.HTTP_201_CREATED, tags=["Admin - Site Config"])
@@ -23,7 +23,7 @@ async def create_site_config(
     service: SiteConfigService = Depends(get_service),
 ):
     """Create site configuration (only if none exists)"""
-    return service.create_config(config)
+    return await service.create_config(config)
 
 
 @router.put("", response_model=SiteConfig, tags=["Admin - Site Config"])
@@ -32,4 +32,4 @@ async def update_site_config(
     service: SiteConfigService = Depends(get_service),
 ):
     """Update site configuration"""
-    return service.update_config(config)
+    return await service.update_config(config)
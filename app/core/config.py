@@ -25,6 +25,55 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
 
+    # Cached aggregate counts (seconds); writes in this process invalidate immediately
+    COUNT_CACHE_TTL: int = 30
+    COUNT_CACHE_MAX_ENTRIES: int = 1024
+
+    # Seconds the site configuration is served from memory without a re-read
+    SITE_CONFIG_CACHE_TTL: int = 60
+
+    # Seconds the catalog tree is cached; section/category writes clear it immediately
+    CATALOG_TREE_CACHE_TTL: int = 300
+
+    # Bulk imports
+    BULK_BATCH_SIZE: int = 200
+    BULK_CONCURRENCY: int = 4
+    EXPORT_PAGE_SIZE: int = 1000
+
+    # Product search: 0 is pure keyword (BM25), 1 is pure vector
+    SEARCH_ALPHA: float = 0.5
+
+    # Query embeddings: the t2v-transformers container Weaviate uses (empty disables
+    # the cache) and the number of normalized queries whose vectors are kept
+    TRANSFORMERS_INFERENCE_URL: str = ""
+    QUERY_VECTOR_CACHE_SIZE: int = 10000
+
+    # Cached search result pages; a product write in any process invalidates them
+    SEARCH_CACHE_TTL: int = 60
+    SEARCH_CACHE_MAX_ENTRIES: int = 2048
+
+    # Seconds a worker trusts its local copy of shared state (catalog version,
+    # order statistics) before reading it from Weaviate again
+    SHARED_STATE_TTL: float = 2.0
+
+    # Slug/SKU to UUID entries kept for product point lookups
+    PRODUCT_KEY_CACHE_MAX_ENTRIES: int = 100000
+
+    # Seconds between full rebuilds of the typeahead index
+    SUGGEST_INDEX_REFRESH_INTERVAL: int = 600
+
+    # Seconds between rebuilds of the shared order statistics from Weaviate, and
+    # between publishes of each worker's statistics deltas
+    ORDER_STATS_RECONCILE_INTERVAL: int = 300
+    ORDER_STATS_FLUSH_INTERVAL: float = 1.0
+
+    # Supplier feed sync: where snapshots and checkpoints live, and the feed rows
+    # sorted in memory at a time while building a snapshot
+    SUPPLIER_SYNC_STATE_DIR: str = "data/supplier_sync"
+    SUPPLIER_SYNC_SORT_RUN_SIZE: int = 50000
+    # Largest share of the previous feed's SKUs one feed may deactivate
+    SUPPLIER_SYNC_MAX_DEACTIVATE_RATIO: float = 0.1
+
     def get_cors_origins(self) -> list[str]:
         """Parse CORS origins from comma-separated string"""
         if isinstance(self.CORS_ORIGINS, str):
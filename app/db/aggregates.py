@@ -0,0 +1,40 @@
+from collections.abc import Hashable
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# One count cache per collection so writes only invalidate their own entries
+_count_caches: dict[str, TTLCache] = {}
+
+
+def _get_count_cache(collection_name: str) -> TTLCache:
+    cache = _count_caches.get(collection_name)
+    if cache is None:
+        cache = _count_caches[collection_name] = TTLCache(
+            maxsize=settings.COUNT_CACHE_MAX_ENTRIES,
+            ttl=settings.COUNT_CACHE_TTL,
+        )
+    return cache
+
+
+async def count_objects(collection, filters=None, cache_key: tuple[Hashable, ...] = ()) -> int:
+    """Count objects matching filters, cached per filter combination
+
+    cache_key must uniquely identify the filter arguments used to build filters.
+    """
+    cache = _get_count_cache(collection.name)
+    total = cache.get(cache_key)
+    if total is None:
+        result = await collection.aggregate.over_all(total_count=True, filters=filters)
+        total = result.total_count or 0
+        cache.set(cache_key, total)
+    return total
+
+
+def invalidate_counts(collection_name: str) -> None:
+    """Drop cached counts for a collection after a write"""
+    cache = _count_caches.get(collection_name)
+    if cache is not None:
+        cache.clear()
@@ -0,0 +1,190 @@
+import copy
+import json
+import types
+import typing
+from enum import Enum
+from typing import Any, Generic, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, create_model
+
+from app.core.cache import TTLCache
+from app.core.exceptions import BadRequestException
+from app.models.category import Category
+from app.models.order import Order, OrderGridItem, OrderItem
+from app.models.product import Product, ProductCard, ProductGridItem
+from app.models.section import Section
+from app.models.site_config import SiteConfig
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _enum_type(annotation) -> type[Enum] | None:
+    """Return the Enum class of an `Enum` or `Enum | None` annotation"""
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return annotation
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        for arg in typing.get_args(annotation):
+            if isinstance(arg, type) and issubclass(arg, Enum):
+                return arg
+    return None
+
+
+def _construct(model: type[ModelT], data: dict[str, Any], fields_set: set[str]) -> ModelT:
+    """Assemble a model instance from already-complete field data
+
+    Equivalent to model_construct for data that already holds every field, but
+    skips its per-call default handling, which costs more than validation itself.
+    """
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", data)
+    object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
+class RowMapper(Generic[ModelT]):
+    """Precomputed converter from stored Weaviate rows to a response model
+
+    Everything that depends only on the model (defaults, JSON-encoded columns,
+    enum fields, nested item models) is worked out once per collection. Rows
+    were validated when the services wrote them, so hydration assembles models
+    directly instead of re-running validation.
+    """
+
+    def __init__(
+        self,
+        model: type[ModelT],
+        json_fields: dict[str, str] | None = None,
+        nested: dict[str, type[BaseModel]] | None = None,
+        views: dict[str, type[BaseModel]] | None = None,
+    ):
+        self.model = model
+        # Stored property name -> model field holding the decoded value
+        self.json_fields = json_fields or {}
+        # Model field -> model of the items in that list
+        self.nested = nested or {}
+        self.fields = frozenset(model.model_fields)
+        self.defaults = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in model.model_fields.items()
+            if not field.is_required()
+        }
+        # Every field in declaration order, so hydrated rows serialize in model order
+        self._template = {name: self.defaults.get(name) for name in model.model_fields}
+        self._mutable_defaults = [
+            name for name, value in self.defaults.items() if isinstance(value, (dict, list, set))
+        ]
+        self.enums = {
+            name: enum
+            for name, field in model.model_fields.items()
+            if (enum := _enum_type(field.annotation)) is not None
+        }
+        decoded = {field: stored for stored, field in self.json_fields.items()}
+        # Stored property names backing the model, for return_properties
+        self.properties = [decoded.get(name, name) for name in model.model_fields if name != "id"]
+        # Named slim models and ad-hoc field selections, mapped lazily
+        self.views = views or {}
+        self._selections = TTLCache(maxsize=64)
+
+    def select(self, fields: str | None) -> "RowMapper":
+        """Mapper for a named view or a comma-separated field list
+
+        Returns self when fields is empty. The selected mapper's properties are
+        the only ones that need to be fetched from Weaviate.
+        """
+        if not fields:
+            return self
+        key = fields.strip()
+        mapper = self._selections.get(key)
+        if mapper is not None:
+            return mapper
+
+        if key in self.views:
+            model = self.views[key]
+        else:
+            names = {name.strip() for name in key.split(",") if name.strip()}
+            unknown = sorted(names - self.fields)
+            if unknown:
+                raise BadRequestException(f"Unknown fields: {', '.join(unknown)}")
+            names.add("id")
+            model = create_model(
+                f"{self.model.__name__}Selection",
+                **{
+                    name: (field.annotation, copy.copy(field))
+                    for name, field in self.model.model_fields.items()
+                    if name in names
+                },
+            )
+
+        mapper = RowMapper(
+            model,
+            json_fields={k: v for k, v in self.json_fields.items() if v in model.model_fields},
+            nested={k: v for k, v in self.nested.items() if k in model.model_fields},
+        )
+        self._selections.set(key, mapper)
+        return mapper
+
+    def to_dict(self, uuid, properties: dict[str, Any]) -> dict[str, Any]:
+        """Convert a stored row to a plain dict of model fields"""
+        data = dict(self._template)
+        for name in self._mutable_defaults:
+            data[name] = copy.copy(data[name])
+
+        json_fields = self.json_fields
+        fields = self.fields
+        for key, value in properties.items():
+            target = json_fields.get(key)
+            if target is not None:
+                if value:
+                    data[target] = json.loads(value)
+            elif key in fields:
+                data[key] = str(value) if isinstance(value, UUID) else value
+
+        data["id"] = str(uuid)
+        return data
+
+    def to_model(self, uuid, properties: dict[str, Any]) -> ModelT:
+        """Build a response model from a stored row without re-validating it"""
+        data = self.to_dict(uuid, properties)
+        for name, enum in self.enums.items():
+            value = data.get(name)
+            if value is not None and not isinstance(value, enum):
+                data[name] = enum(value)
+        for name, item_model in self.nested.items():
+            items = data.get(name)
+            if items:
+                data[name] = [
+                    item if isinstance(item, BaseModel) else _construct(item_model, dict(item), set(item))
+                    for item in items
+                ]
+        return _construct(self.model, data, self._fields_set(properties))
+
+    def _fields_set(self, properties: dict[str, Any]) -> set[str]:
+        """Model fields explicitly present on a stored row"""
+        json_fields = self.json_fields
+        present = {json_fields.get(key, key) for key in properties}
+        present &= self.fields
+        present.add("id")
+        return present
+
+    def from_object(self, obj) -> ModelT:
+        """Build a response model from a Weaviate object"""
+        return self.to_model(obj.uuid, obj.properties)
+
+
+product_mapper = RowMapper(
+    Product,
+    json_fields={"attributes_json": "attributes"},
+    views={"grid": ProductGridItem, "card": ProductCard},
+)
+order_mapper = RowMapper(
+    Order,
+    json_fields={"items_json": "items"},
+    nested={"items": OrderItem},
+    views={"grid": OrderGridItem},
+)
+category_mapper = RowMapper(Category)
+section_mapper = RowMapper(Section)
+site_config_mapper = RowMapper(SiteConfig)
@@ -0,0 +1,150 @@
+import base64
+import binascii
+import hashlib
+import json
+from typing import Any
+from uuid import UUID
+
+from weaviate.classes.query import Filter, Sort
+
+from app.core.exceptions import BadRequestException
+
+# Filtered listings are ordered by this property so they can be paged by keyset;
+# an integer copy of created_at, see keyset_timestamp
+KEYSET_PROPERTY = "created_ts"
+# IDs sharing the last keyset value that a cursor lists before it switches to
+# skipping a count of them, which keeps cursors short on large ties
+MAX_CURSOR_IDS = 50
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """Encode a cursor payload as an opaque URL-safe token"""
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """Decode an opaque cursor token"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise BadRequestException("Invalid cursor")
+    if not isinstance(payload, dict):
+        raise BadRequestException("Invalid cursor")
+    return payload
+
+
+def build_page_query(
+    filters,
+    page: int,
+    page_size: int,
+    cursor: str | None = None,
+    return_properties: list[str] | None = None,
+) -> dict[str, Any]:
+    """Build fetch_objects arguments for an offset or cursor page
+
+    Unfiltered listings page with Weaviate's UUID `after` cursor, which cannot be
+    combined with filters or sorting. Filtered listings are sorted by
+    KEYSET_PROPERTY and continue from the last value seen, excluding the IDs that
+    shared that value on the previous page. Once more than MAX_CURSOR_IDS rows
+    share the value, the cursor skips that many rows of the tie instead, relying
+    on Weaviate's order within a tie being stable. When return_properties is
+    given only those properties are fetched, plus KEYSET_PROPERTY if the next
+    cursor needs it.
+    """
+    query: dict[str, Any] = {"limit": page_size}
+    if filters is not None:
+        query["sort"] = Sort.by_property(name=KEYSET_PROPERTY, ascending=True)
+    if return_properties is not None:
+        if filters is not None and KEYSET_PROPERTY not in return_properties:
+            return_properties = [*return_properties, KEYSET_PROPERTY]
+        query["return_properties"] = return_properties
+
+    if cursor is None:
+        query["offset"] = (page - 1) * page_size
+        if filters is not None:
+            query["filters"] = filters
+        return query
+
+    payload = decode_cursor(cursor)
+    if filters is None:
+        if "after" not in payload:
+            raise BadRequestException("Cursor does not match the requested filters")
+        query["after"] = payload["after"]
+        return query
+
+    if KEYSET_PROPERTY not in payload:
+        raise BadRequestException("Cursor does not match the requested filters")
+    value = payload[KEYSET_PROPERTY]
+    skip = payload.get("skip")
+    if skip is not None:
+        if not isinstance(skip, int) or skip < 1:
+            raise BadRequestException("Invalid cursor")
+        query["filters"] = Filter.all_of([filters, Filter.by_property(KEYSET_PROPERTY).greater_or_equal(value)])
+        query["offset"] = skip
+        return query
+
+    ids = payload.get("ids")
+    if not ids or not isinstance(ids, list):
+        raise BadRequestException("Cursor does not match the requested filters")
+    try:
+        payload["ids"] = [str(UUID(str(object_id))) for object_id in ids]
+    except ValueError:
+        raise BadRequestException("Invalid cursor")
+    keyset = Filter.any_of([
+        Filter.by_property(KEYSET_PROPERTY).greater_than(value),
+        Filter.all_of([
+            Filter.by_property(KEYSET_PROPERTY).equal(value),
+            Filter.by_id().contains_none(payload["ids"]),
+        ]),
+    ])
+    query["filters"] = Filter.all_of([filters, keyset])
+    return query
+
+
+def build_next_cursor(objects: list, page_size: int, filters, cursor: str | None = None) -> str | None:
+    """Build the cursor for the page following the given objects, if any"""
+    if len(objects) < page_size or not objects:
+        return None
+
+    if filters is None:
+        return encode_cursor({"after": str(objects[-1].uuid)})
+
+    value = objects[-1].properties.get(KEYSET_PROPERTY)
+    ids = [str(obj.uuid) for obj in objects if obj.properties.get(KEYSET_PROPERTY) == value]
+    if cursor is not None:
+        previous = decode_cursor(cursor)
+        if previous.get(KEYSET_PROPERTY) == value:
+            if "skip" in previous:
+                return encode_cursor({KEYSET_PROPERTY: value, "skip": previous["skip"] + len(ids)})
+            ids = previous["ids"] + ids
+    if len(ids) > MAX_CURSOR_IDS:
+        return encode_cursor({KEYSET_PROPERTY: value, "skip": len(ids)})
+    return encode_cursor({KEYSET_PROPERTY: value, "ids": ids})
+
+
+def query_fingerprint(*parts: Any) -> str:
+    """Short stable digest of the arguments a cursor was issued for"""
+    raw = json.dumps(parts, separators=(",", ":"), default=str).encode()
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def decode_offset_cursor(cursor: str, fingerprint: str) -> int:
+    """Return the offset stored in a ranked-results cursor
+
+    Relevance-ranked results have no stable sort key, so their cursors carry an
+    offset together with a fingerprint of the query they belong to.
+    """
+    payload = decode_cursor(cursor)
+    offset = payload.get("offset")
+    if payload.get("q") != fingerprint or not isinstance(offset, int) or offset < 0:
+        raise BadRequestException("Cursor does not match the requested query")
+    return offset
+
+
+def build_offset_cursor(objects: list, offset: int, limit: int, fingerprint: str) -> str | None:
+    """Build the cursor for the ranked page following the given objects, if any"""
+    if len(objects) < limit or not objects:
+        return None
+    return encode_cursor({"offset": offset + len(objects), "q": fingerprint})
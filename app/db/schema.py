@@ -1,18 +1,89 @@
 from datetime import datetime
 
-from weaviate.classes.config import Configure, DataType, Property
+from weaviate.classes.config import Configure, DataType, Property, Tokenization
 
 from app.core.logging import get_logger
+from app.db.shared_state import SHARED_STATE_COLLECTION, shared_state_uuid
+from app.db.writes import keyset_timestamp
 
 logger = get_logger(__name__)
 
 
+def _text(name: str) -> Property:
+    """Descriptive text: vectorized (without its property name) and keyword searchable"""
+    return Property(name=name, data_type=DataType.TEXT, vectorize_property_name=False)
+
+
+def _key(name: str, searchable: bool = False, tokenization: Tokenization = Tokenization.FIELD) -> Property:
+    """Identifier matched as a whole value (IDs, SKU, slug, status); never vectorized"""
+    return Property(
+        name=name,
+        data_type=DataType.TEXT,
+        tokenization=tokenization,
+        skip_vectorization=True,
+        index_searchable=searchable,
+    )
+
+
+def _meta(name: str) -> Property:
+    """Bookkeeping text such as timestamps and URLs; filterable and sortable only"""
+    return Property(name=name, data_type=DataType.TEXT, skip_vectorization=True, index_searchable=False)
+
+
+def _range(name: str, data_type: DataType) -> Property:
+    """Number compared with greater/less than filters"""
+    return Property(name=name, data_type=data_type, index_range_filters=True)
+
+
+def _vectorizer():
+    # Only the property values are embedded, not the collection name
+    return Configure.Vectorizer.text2vec_transformers(vectorize_collection_name=False)
+
+
+def _create_shared_state(client):
+    """Small values shared by every worker and script, one object per name"""
+    client.collections.create(
+        name="SharedState",
+        description="Values shared across API workers and scripts",
+        properties=[
+            _key("name"),
+            Property(
+                name="value",
+                data_type=DataType.TEXT,
+                skip_vectorization=True,
+                index_filterable=False,
+                index_searchable=False,
+            ),
+            _meta("updated_at"),
+        ],
+        vectorizer_config=Configure.Vectorizer.none(),
+    )
+
+
+# Properties added after the first release, created on existing collections at startup
+ADDED_PROPERTIES = {
+    "Product": [
+        # Digest of the stored content, used to skip writes that change nothing
+        _key("content_hash"),
+        # created_at as a number, the keyset of filtered listings
+        _range("created_ts", DataType.INT),
+    ],
+    "Order": [
+        _range("created_ts", DataType.INT),
+    ],
+}
+
+# Collections whose created_ts is filled in for objects written before it existed
+KEYSET_BACKFILL = ("Product", "Order")
+KEYSET_BACKFILL_MARKER = "created_ts_backfilled"
+
+
 def create_schema(client):
     """Create all Weaviate collections for the ecommerce platform"""
     logger.info("Creating Weaviate schema...")
 
     # Delete existing collections if they exist (for fresh setup)
-    collections_to_delete = ["SiteConfig", "Section", "Category", "Product", "Order"]
+    collections_to_delete = ["SiteConfig", "Section", "Category", "Product", "Order", "SharedState"]
     for collection_name in collections_to_delete:
         try:
             client.collections.delete(collection_name)
@@ -54,15 +125,15 @@ def create_schema(client):
         name="Section",
         description="Website sections and subsections",
         properties=[
-            Property(name="name", data_type=DataType.TEXT),
-            Property(name="description", data_type=DataType.TEXT),
+            _text("name"),
+            _text("description"),
             Property(name="order", data_type=DataType.INT),
             Property(name="is_active", data_type=DataType.BOOL),
-            Property(name="parent_section_id", data_type=DataType.TEXT),
-            Property(name="created_at", data_type=DataType.TEXT),
-            Property(name="updated_at", data_type=DataType.TEXT),
+            _key("parent_section_id"),
+            _meta("created_at"),
+            _meta("updated_at"),
         ],
-        vectorizer_config=Configure.Vectorizer.text2vec_transformers(),
+        vectorizer_config=_vectorizer(),
     )
     logger.info("Created Section collection")
 
@@ -71,18 +142,18 @@ def create_schema(client):
         name="Category",
         description="Product categories and subcategories",
         properties=[
-            Property(name="name", data_type=DataType.TEXT),
-            Property(name="description", data_type=DataType.TEXT),
-            Property(name="section_id", data_type=DataType.TEXT),
-            Property(name="parent_category_id", data_type=DataType.TEXT),
+            _text("name"),
+            _text("description"),
+            _key("section_id"),
+            _key("parent_category_id"),
             Property(name="is_active", data_type=DataType.BOOL),
             Property(name="order", data_type=DataType.INT),
-            Property(name="slug", data_type=DataType.TEXT),
-            Property(name="image_url", data_type=DataType.TEXT),
-            Property(name="created_at", data_type=DataType.TEXT),
-            Property(name="updated_at", data_type=DataType.TEXT),
+            _key("slug"),
+            _meta("image_url"),
+            _meta("created_at"),
+            _meta("updated_at"),
         ],
-        vectorizer_config=Configure.Vectorizer.text2vec_transformers(),
+        vectorizer_config=_vectorizer(),
     )
     logger.info("Created Category collection")
 
@@ -91,25 +162,28 @@ def create_schema(client):
         name="Product",
         description="Products and items for sale",
         properties=[
-            Property(name="name", data_type=DataType.TEXT),
-            Property(name="description", data_type=DataType.TEXT),
-            Property(name="price", data_type=DataType.NUMBER),
-            Property(name="compare_at_price", data_type=DataType.NUMBER),
-            Property(name="cost", data_type=DataType.NUMBER),
-            Property(name="category_id", data_type=DataType.TEXT),
-            Property(name="section_id", data_type=DataType.TEXT),
-            Property(name="sku", data_type=DataType.TEXT),
-            Property(name="inventory_quantity", data_type=DataType.INT),
-            Property(name="image_url", data_type=DataType.TEXT),
+            _text("name"),
+            _text("description"),
+            _range("price", DataType.NUMBER),
+            _range("compare_at_price", DataType.NUMBER),
+            _range("cost", DataType.NUMBER),
+            _key("category_id"),
+            _key("section_id"),
+            # Exact SKU matches stay in the keyword half of hybrid search
+            _key("sku", searchable=True),
+            _range("inventory_quantity", DataType.INT),
+            _meta("image_url"),
             Property(name="is_active", data_type=DataType.BOOL),
             Property(name="featured", data_type=DataType.BOOL),
-            Property(name="discount_percentage", data_type=DataType.NUMBER),
-            Property(name="attributes_json", data_type=DataType.TEXT),  # Store as JSON string
-            Property(name="slug", data_type=DataType.TEXT),
-            Property(name="created_at", data_type=DataType.TEXT),
-            Property(name="updated_at", data_type=DataType.TEXT),
+            _range("discount_percentage", DataType.NUMBER),
+            # Store as JSON string; keyword searchable, but JSON syntax is noise to the vectorizer
+            Property(name="attributes_json", data_type=DataType.TEXT, skip_vectorization=True),
+            _key("slug"),
+            _meta("created_at"),
+            _meta("updated_at"),
+            *ADDED_PROPERTIES["Product"],
         ],
-        vectorizer_config=Configure.Vectorizer.text2vec_transformers(),
+        vectorizer_config=_vectorizer(),
     )
     logger.info("Created Product collection")
 
@@ -118,9 +192,10 @@ def create_schema(client):
         name="Order",
         description="Customer orders",
         properties=[
-            Property(name="order_number", data_type=DataType.TEXT),
+            _key("order_number"),
             Property(name="customer_name", data_type=DataType.TEXT),
-            Property(name="customer_email", data_type=DataType.TEXT),
+            # Addresses differing only in case are the same customer
+            _key("customer_email", tokenization=Tokenization.LOWERCASE),
             Property(name="customer_phone", data_type=DataType.TEXT),
             Property(name="shipping_address", data_type=DataType.TEXT),
             Property(name="billing_address", data_type=DataType.TEXT),
@@ -128,15 +203,20 @@ def create_schema(client):
             Property(name="subtotal", data_type=DataType.NUMBER),
             Property(name="tax", data_type=DataType.NUMBER),
             Property(name="shipping_cost", data_type=DataType.NUMBER),
-            Property(name="total", data_type=DataType.NUMBER),
-            Property(name="status", data_type=DataType.TEXT),
+            _range("total", DataType.NUMBER),
+            _key("status"),
             Property(name="notes", data_type=DataType.TEXT),
-            Property(name="created_at", data_type=DataType.TEXT),
-            Property(name="updated_at", data_type=DataType.TEXT),
+            _meta("created_at"),
+            _meta("updated_at"),
+            *ADDED_PROPERTIES["Order"],
         ],
     )
     logger.info("Created Order collection")
 
+    # 6. SharedState Collection
+    _create_shared_state(client)
+    logger.info("Created SharedState collection")
+
     logger.info("All collections created successfully!")
 
 
@@ -169,6 +249,60 @@ def initialize_default_config(client):
         logger.info("Site configuration already exists")
 
 
+def migrate_schema(client):
+    """Add properties introduced since an existing schema was created"""
+    for collection_name, properties in ADDED_PROPERTIES.items():
+        collection = client.collections.get(collection_name)
+        existing = {prop.name for prop in collection.config.get().properties}
+        for prop in properties:
+            if prop.name not in existing:
+                collection.config.add_property(prop)
+                logger.info(f"Added property {collection_name}.{prop.name}")
+
+    if not client.collections.exists("SharedState"):
+        _create_shared_state(client)
+        logger.info("Created SharedState collection")
+
+    backfill_keyset(client)
+
+
+def backfill_keyset(client):
+    """Set created_ts on objects written before it existed
+
+    Runs until one pass has completed, which is recorded in SharedState so
+    later startups skip it. Objects without it would drop out of filtered
+    listings, so this has to finish before the API serves them.
+    """
+    state = client.collections.get(SHARED_STATE_COLLECTION)
+    marker = shared_state_uuid(KEYSET_BACKFILL_MARKER)
+    if state.query.fetch_object_by_id(marker) is not None:
+        return
+
+    for collection_name in KEYSET_BACKFILL:
+        collection = client.collections.get(collection_name)
+        filled = 0
+        for obj in collection.iterator(return_properties=["created_at", "created_ts"]):
+            if obj.properties.get("created_ts") is not None or not obj.properties.get("created_at"):
+                continue
+            try:
+                created_ts = keyset_timestamp(obj.properties["created_at"])
+            except ValueError:
+                logger.warning(f"Cannot backfill created_ts of {collection_name} {obj.uuid}")
+                continue
+            collection.data.update(uuid=obj.uuid, properties={"created_ts": created_ts})
+            filled += 1
+        logger.info(f"Backfilled created_ts on {filled} {collection_name} objects")
+
+    try:
+        state.data.insert(
+            {"name": KEYSET_BACKFILL_MARKER, "value": "true", "updated_at": datetime.utcnow().isoformat()},
+            uuid=marker,
+        )
+    except Exception as e:
+        # Another worker finished the same backfill first
+        logger.debug(f"Backfill marker already written: {e}")
+
+
 def check_schema(client):
     """Check if schema exists"""
     try:
@@ -178,3 +312,15 @@ def check_schema(client):
         return True
     except:
         return False
+
+
+async def check_schema_async(client):
+    """Check if schema exists using the async client"""
+    try:
+        collections = ["SiteConfig", "Section", "Category", "Product", "Order"]
+        for collection_name in collections:
+            if not await client.collections.exists(collection_name):
+                return False
+        return True
+    except Exception:
+        return False
@@ -0,0 +1,87 @@
+import json
+import time
+from datetime import datetime
+from typing import Any
+
+from weaviate.classes.data import DataObject
+from weaviate.classes.query import Filter
+from weaviate.util import generate_uuid5
+
+SHARED_STATE_COLLECTION = "SharedState"
+# Objects read per query when listing shared values by name prefix
+LIST_PAGE_SIZE = 100
+
+
+def shared_state_uuid(name: str):
+    """UUID of the SharedState object holding name"""
+    return generate_uuid5(name, SHARED_STATE_COLLECTION)
+
+
+class SharedValue:
+    """A small JSON value shared by every API worker and script through Weaviate
+
+    Reads are served from a local copy for ttl seconds, so a write made by
+    another process is seen within ttl; writes made by this process are seen
+    immediately.
+    """
+
+    def __init__(self, name: str, ttl: float):
+        self.name = name
+        self.uuid = shared_state_uuid(name)
+        self.ttl = ttl
+        self._value: Any = None
+        self._expires = 0.0
+
+    async def get(self, client, fresh: bool = False) -> Any:
+        """Current value, or None if it was never set"""
+        if not fresh and time.monotonic() < self._expires:
+            return self._value
+        collection = client.collections.get(SHARED_STATE_COLLECTION)
+        obj = await collection.query.fetch_object_by_id(self.uuid)
+        value = json.loads(obj.properties["value"]) if obj and obj.properties.get("value") else None
+        self._remember(value)
+        return value
+
+    async def set(self, client, value: Any) -> None:
+        """Replace the value for every process"""
+        collection = client.collections.get(SHARED_STATE_COLLECTION)
+        properties = {
+            "name": self.name,
+            "value": json.dumps(value),
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+        # Writing an existing UUID replaces the object, so this is an upsert
+        response = await collection.data.insert_many([DataObject(properties=properties, uuid=self.uuid)])
+        if response.has_errors:
+            raise RuntimeError(f"Failed to write shared value {self.name}: {response.errors[0].message}")
+        self._remember(value)
+
+    def _remember(self, value: Any):
+        self._value = value
+        self._expires = time.monotonic() + self.ttl
+
+
+async def read_shared_values(client, prefix: str) -> dict[str, Any]:
+    """Every shared value whose name starts with prefix, by name"""
+    collection = client.collections.get(SHARED_STATE_COLLECTION)
+    values = {}
+    offset = 0
+    while True:
+        result = await collection.query.fetch_objects(
+            filters=Filter.by_property("name").like(f"{prefix}*"),
+            limit=LIST_PAGE_SIZE,
+            offset=offset,
+            return_properties=["name", "value"],
+        )
+        for obj in result.objects:
+            if obj.properties.get("value"):
+                values[obj.properties["name"]] = json.loads(obj.properties["value"])
+        if len(result.objects) < LIST_PAGE_SIZE:
+            return values
+        offset += LIST_PAGE_SIZE
+
+
+async def delete_shared_values(client, prefix: str) -> None:
+    """Delete every shared value whose name starts with prefix"""
+    collection = client.collections.get(SHARED_STATE_COLLECTION)
+    await collection.data.delete_many(where=Filter.by_property("name").like(f"{prefix}*"))
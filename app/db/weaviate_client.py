@@ -1,4 +1,4 @@
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 
 import weaviate
 
@@ -49,8 +49,50 @@ class WeaviateClient:
         return self._client
 
 
-# Global instance
+class AsyncWeaviateClient:
+    """Async Weaviate client singleton used by the API request path"""
+
+    _instance = None
+    _client = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    async def connect(self):
+        """Connect to Weaviate"""
+        if self._client is None:
+            try:
+                client = weaviate.use_async_with_local(
+                    host=settings.WEAVIATE_HOST,
+                    port=settings.WEAVIATE_PORT,
+                )
+                await client.connect()
+                self._client = client
+                logger.info(f"Connected async client to Weaviate at {settings.WEAVIATE_HOST}:{settings.WEAVIATE_PORT}")
+            except Exception as e:
+                logger.error(f"Failed to connect async client to Weaviate: {e}")
+                raise
+        return self._client
+
+    async def close(self):
+        """Close Weaviate connection"""
+        if self._client:
+            await self._client.close()
+            self._client = None
+            logger.info("Closed async Weaviate connection")
+
+    async def get_client(self):
+        """Get client instance"""
+        if self._client is None:
+            return await self.connect()
+        return self._client
+
+
+# Global instances
 weaviate_client = WeaviateClient()
+async_weaviate_client = AsyncWeaviateClient()
 
 
 def get_weaviate_client():
@@ -58,6 +100,11 @@ def get_weaviate_client():
     return weaviate_client.client
 
 
+async def get_async_weaviate_client():
+    """Dependency to get the async Weaviate client"""
+    return await async_weaviate_client.get_client()
+
+
 @contextmanager
 def get_db():
     """Context manager for database operations"""
@@ -67,3 +114,14 @@ def get_db():
     except Exception as e:
         logger.error(f"Database error: {e}")
         raise
+
+
+@asynccontextmanager
+async def get_async_db():
+    """Async context manager for database operations"""
+    client = await get_async_weaviate_client()
+    try:
+        yield client
+    except Exception as e:
+        logger.error(f"Database error: {e}")
+        raise
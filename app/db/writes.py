@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from weaviate.exceptions import UnexpectedStatusCodeError
+
+# Bookkeeping properties that are not part of an object's content
+UNHASHED_PROPERTIES = frozenset({"content_hash", "created_at", "created_ts", "updated_at"})
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def content_hash(properties: dict[str, Any]) -> str:
+    """Digest of an object's stored content, ignoring timestamps and unset values
+
+    Numbers are compared as floats, since Weaviate may hand back 10.0 for a
+    number written as 10.
+    """
+    content = {}
+    for key, value in properties.items():
+        if value is None or key in UNHASHED_PROPERTIES:
+            continue
+        if isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        content[key] = value
+    payload = json.dumps(content, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def stored_hash(properties: dict[str, Any]) -> str:
+    """Content hash of a fetched row; rows written before hashing are hashed now"""
+    return properties.get("content_hash") or content_hash(properties)
+
+
+def batch_timestamps(count: int) -> list[str]:
+    """Distinct ISO timestamps, a microsecond apart, for rows created in one batch
+
+    Filtered listings page by creation time, so rows sharing one value make
+    the keyset cursor carry all of their IDs.
+    """
+    start = datetime.utcnow()
+    return [(start + timedelta(microseconds=i)).isoformat(timespec="microseconds") for i in range(count)]
+
+
+def keyset_timestamp(created_at: str) -> int:
+    """created_at as whole microseconds since the epoch, stored as created_ts
+
+    Filtered listings sort and page on this number rather than on the text,
+    which collections created before field tokenization compare word by word.
+    """
+    moment = datetime.fromisoformat(created_at)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+def is_not_found(error: BaseException) -> bool:
+    """Whether a Weaviate error means the target object does not exist"""
+    return isinstance(error, UnexpectedStatusCodeError) and error.status_code == 404
+
+
+def is_already_exists(error: BaseException) -> bool:
+    """Whether a Weaviate error means an object with the inserted UUID already exists"""
+    return (
+        isinstance(error, UnexpectedStatusCodeError)
+        and error.status_code == 422
+        and "already exists" in str(error)
+    )
+
+
+async def update_object(collection, uuid: str, properties: dict[str, Any]) -> bool:
+    """Partially update an object; False if it does not exist"""
+    try:
+        await collection.data.update(uuid=uuid, properties=properties)
+    except UnexpectedStatusCodeError as e:
+        if is_not_found(e):
+            return False
+        raise
+    return True
+
+
+async def patch_object(collection, uuid: str, properties: dict[str, Any]) -> dict[str, Any] | None:
+    """Partially update an object and return its stored properties with the patch applied
+
+    The current row is read concurrently with the write. Whichever version the
+    read observes, merging the patch over it yields the row as written, so the
+    update costs a single round trip of latency. Returns None if the object
+    does not exist.
+    """
+    current, written = await asyncio.gather(
+        collection.query.fetch_object_by_id(uuid),
+        collection.data.update(uuid=uuid, properties=properties),
+        return_exceptions=True,
+    )
+    if isinstance(written, BaseException):
+        if is_not_found(written):
+            return None
+        raise written
+    if isinstance(current, BaseException):
+        raise current
+    if current is None:
+        return None
+    return {**current.properties, **properties}
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -6,13 +7,55 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
 from app.core.config import get_settings
 from app.core.logging import get_logger
-from app.db.schema import check_schema, create_schema, initialize_default_config
-from app.db.weaviate_client import weaviate_client
+from app.db.schema import (
+    check_schema,
+    create_schema,
+    initialize_default_config,
+    migrate_schema,
+)
+from app.db.weaviate_client import async_weaviate_client, weaviate_client
+from app.services.order_service import OrderService
+from app.services.order_stats import order_stats_store
+from app.services.query_vectors import query_vector_cache
+from app.services.suggest_index import suggest_index
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 
+async def reconcile_order_statistics():
+    """Periodically rebuild the shared order statistics to repair drift"""
+    while True:
+        try:
+            client = await async_weaviate_client.get_client()
+            await OrderService(client).reconcile_statistics()
+        except Exception as e:
+            logger.error(f"Failed to reconcile order statistics: {e}")
+        await asyncio.sleep(settings.ORDER_STATS_RECONCILE_INTERVAL)
+
+
+async def flush_order_statistics():
+    """Publish this worker's order statistics deltas for the other workers"""
+    while True:
+        await asyncio.sleep(settings.ORDER_STATS_FLUSH_INTERVAL)
+        try:
+            client = await async_weaviate_client.get_client()
+            await order_stats_store.flush(client)
+        except Exception as e:
+            logger.error(f"Failed to publish order statistics: {e}")
+
+
+async def refresh_suggest_index():
+    """Build the typeahead index, then rebuild it to pick up other workers' writes"""
+    while True:
+        try:
+            client = await async_weaviate_client.get_client()
+            await suggest_index.rebuild(client)
+        except Exception as e:
+            logger.error(f"Failed to rebuild suggest index: {e}")
+        await asyncio.sleep(settings.SUGGEST_INDEX_REFRESH_INTERVAL)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
@@ -31,15 +74,32 @@ async def lifespan(app: FastAPI):
             initialize_default_config(client)
         else:
             logger.info("Schema already exists")
+            migrate_schema(client)
+
+        # Connect the async client used by request handlers
+        await async_weaviate_client.connect()
 
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
 
+    reconcile_task = asyncio.create_task(reconcile_order_statistics())
+    flush_task = asyncio.create_task(flush_order_statistics())
+    suggest_task = asyncio.create_task(refresh_suggest_index())
+
     yield
 
     # Shutdown
     logger.info("Shutting down application...")
+    reconcile_task.cancel()
+    flush_task.cancel()
+    suggest_task.cancel()
+    try:
+        await order_stats_store.flush(await async_weaviate_client.get_client())
+    except Exception as e:
+        logger.error(f"Failed to publish order statistics: {e}")
+    await query_vector_cache.close()
+    await async_weaviate_client.close()
     weaviate_client.close()
 
 
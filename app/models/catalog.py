@@ -0,0 +1,48 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class CatalogBreadcrumb(BaseModel):
+    """Ancestor entry in a catalog path"""
+
+    id: str
+    name: str
+    type: Literal["section", "category"]
+
+
+class CategoryNode(BaseModel):
+    """Category in the catalog tree"""
+
+    id: str
+    name: str
+    description: str | None = None
+    slug: str | None = None
+    image_url: str | None = None
+    order: int = 0
+    is_active: bool = True
+    section_id: str
+    parent_category_id: str | None = None
+    path: list[CatalogBreadcrumb] = []
+    children: list["CategoryNode"] = []
+
+
+class SectionNode(BaseModel):
+    """Section in the catalog tree"""
+
+    id: str
+    name: str
+    description: str | None = None
+    order: int = 0
+    is_active: bool = True
+    parent_section_id: str | None = None
+    path: list[CatalogBreadcrumb] = []
+    subsections: list["SectionNode"] = []
+    categories: list[CategoryNode] = []
+
+
+class CatalogTree(BaseModel):
+    """Full section and category hierarchy"""
+
+    sections: list[SectionNode]
+    generated_at: str
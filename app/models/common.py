@@ -20,6 +20,41 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page_size: int
     total_pages: int
     data: list[T]
+    next_cursor: str | None = None
+
+
+class SearchHit(BaseModel, Generic[T]):
+    """Search result with its relevance score"""
+
+    score: float | None = None
+    item: T
+
+
+class SearchResponse(BaseModel, Generic[T]):
+    """Ranked search results"""
+
+    limit: int
+    offset: int
+    data: list[SearchHit[T]]
+    next_cursor: str | None = None
+
+
+class BulkItemError(BaseModel):
+    """Error for a single item of a bulk operation"""
+
+    index: int
+    key: str | None = None
+    message: str
+
+
+class BulkOperationResult(BaseModel):
+    """Summary of a bulk update or delete"""
+
+    matched: int = 0
+    succeeded: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    errors: list[BulkItemError] = []
 
 
 class HealthResponse(BaseModel):
@@ -1,6 +1,9 @@
 from enum import Enum
+from typing import Annotated, Literal
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, model_validator
+
+from app.models.common import PaginatedResponse
 
 
 class OrderStatus(str, Enum):
@@ -66,6 +69,82 @@ class Order(OrderBase):
         from_attributes = True
 
 
+class OrderStatusTransition(BaseModel):
+    """Bulk status change for orders given by ID and/or order number"""
+
+    ids: list[str] = Field(default=[], max_length=1000)
+    order_numbers: list[str] = Field(default=[], max_length=1000)
+    status: OrderStatus
+    notes: str | None = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.ids and not self.order_numbers:
+            raise ValueError("Provide ids or order_numbers")
+        return self
+
+
+class OrderTransitionItem(BaseModel):
+    """Outcome of a bulk status change for one order"""
+
+    key: str
+    id: str | None = None
+    previous_status: str | None = None
+    result: Literal["updated", "unchanged", "not_found", "invalid_transition", "failed"]
+    message: str | None = None
+
+
+class OrderTransitionResult(BaseModel):
+    """Summary of a bulk status change, with one entry per requested order"""
+
+    requested: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    results: list[OrderTransitionItem] = []
+
+
+class OrderGridItem(BaseModel):
+    """Slim order model for admin grids"""
+
+    id: str
+    order_number: str
+    customer_name: str
+    customer_email: str
+    total: float
+    status: OrderStatus = OrderStatus.PENDING
+    created_at: str
+
+
+class OrderFields(BaseModel):
+    """Order projected to a comma-separated fields list; unrequested fields are omitted"""
+
+    id: str
+    order_number: str | None = None
+    customer_name: str | None = None
+    customer_email: str | None = None
+    customer_phone: str | None = None
+    shipping_address: str | None = None
+    billing_address: str | None = None
+    items: list[OrderItem] | None = None
+    subtotal: float | None = None
+    tax: float | None = None
+    shipping_cost: float | None = None
+    total: float | None = None
+    status: OrderStatus | None = None
+    notes: str | None = None
+    created_at: str | None = None
+    updated_at: str | None = None
+
+
+# An order in a response: the full model, or the view or field list picked with fields=
+OrderView = Annotated[Order | OrderGridItem | OrderFields, Field(union_mode="left_to_right")]
+
+
+class OrderPage(PaginatedResponse[OrderView]):
+    """Page of orders, whole or projected with fields="""
+
+
 class OrderStatistics(BaseModel):
     """Order statistics model"""
 
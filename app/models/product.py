@@ -1,6 +1,13 @@
-from typing import Any
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from app.models.common import (
+    BulkItemError,
+    PaginatedResponse,
+    SearchHit,
+    SearchResponse,
+)
 
 
 class ProductBase(BaseModel):
@@ -48,6 +55,44 @@ class ProductUpdate(BaseModel):
     slug: str | None = None
 
 
+class ProductPatchItem(ProductUpdate):
+    """Per-product changes in a bulk update"""
+
+    id: str
+
+
+class ProductBulkUpdate(BaseModel):
+    """Bulk update of products by ID"""
+
+    items: list[ProductPatchItem] = Field(..., min_length=1, max_length=20000)
+
+
+class ProductSelector(BaseModel):
+    """Products matched by a bulk operation; at least one condition is required"""
+
+    ids: list[str] | None = Field(None, max_length=20000)
+    category_id: str | None = None
+    section_id: str | None = None
+    is_active: bool | None = None
+    featured: bool | None = None
+    min_price: float | None = None
+    max_price: float | None = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        conditions = self.model_dump(exclude={"ids"}).values()
+        if not self.ids and all(value is None for value in conditions):
+            raise ValueError("At least one selection condition is required")
+        return self
+
+
+class ProductFilterUpdate(BaseModel):
+    """Bulk update of the products matching a selector"""
+
+    filter: ProductSelector
+    update: ProductUpdate
+
+
 class Product(ProductBase):
     """Product response model"""
 
@@ -57,3 +102,102 @@ class Product(ProductBase):
 
     class Config:
         from_attributes = True
+
+
+class ProductGridItem(BaseModel):
+    """Slim product model for admin grids"""
+
+    id: str
+    name: str
+    sku: str | None = None
+    price: float
+    inventory_quantity: int = 0
+    is_active: bool = True
+    featured: bool = False
+
+
+class ProductCard(BaseModel):
+    """Slim product model for storefront cards"""
+
+    id: str
+    name: str
+    slug: str | None = None
+    price: float
+    compare_at_price: float | None = None
+    discount_percentage: float = 0.0
+    image_url: str | None = None
+    featured: bool = False
+
+
+class ProductFields(ProductUpdate):
+    """Product projected to a comma-separated fields list; unrequested fields are omitted"""
+
+    id: str
+    created_at: str | None = None
+    updated_at: str | None = None
+
+
+# A product in a response: the full model, or the view or field list picked with fields=
+ProductView = Annotated[
+    Product | ProductGridItem | ProductCard | ProductFields,
+    Field(union_mode="left_to_right"),
+]
+
+
+class ProductPage(PaginatedResponse[ProductView]):
+    """Page of products, whole or projected with fields="""
+
+
+class ProductHit(SearchHit[ProductView]):
+    """Scored product, whole or projected with fields="""
+
+
+class ProductSearchResponse(SearchResponse[ProductView]):
+    """Ranked products, whole or projected with fields="""
+
+    data: list[ProductHit]
+
+
+class ProductBatchGet(BaseModel):
+    """Product multi-get request"""
+
+    ids: list[str] = Field(..., min_length=1, max_length=500)
+
+
+class ProductBatch(BaseModel):
+    """Products resolved by a multi-get, in request order"""
+
+    data: list[ProductView]
+    missing: list[str] = []
+
+
+class ProductSuggestion(BaseModel):
+    """Typeahead suggestion"""
+
+    text: str
+    kind: Literal["name", "sku", "category"]
+    id: str
+
+
+class ProductImportResult(BaseModel):
+    """Bulk product import summary"""
+
+    total: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    errors: list[BulkItemError] = []
+
+
+class ProductSyncResult(BaseModel):
+    """Supplier feed sync summary"""
+
+    total: int = 0
+    created: int = 0
+    updated: int = 0
+    deactivated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    resumed: bool = False
+    errors: list[BulkItemError] = []
@@ -0,0 +1,109 @@
+import asyncio
+from datetime import datetime
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.exceptions import DatabaseException
+from app.core.logging import get_logger
+from app.models.catalog import CatalogBreadcrumb, CatalogTree, CategoryNode, SectionNode
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Keyed by include_inactive; SectionService and CategoryService writes clear it
+_tree_cache = TTLCache(maxsize=2, ttl=settings.CATALOG_TREE_CACHE_TTL)
+
+
+def invalidate_catalog_tree() -> None:
+    """Drop the cached catalog tree after a section or category write"""
+    _tree_cache.clear()
+
+
+def _sort_key(node):
+    return (node.order, node.name.lower())
+
+
+class CatalogService:
+    """Service for the storefront section/category hierarchy"""
+
+    def __init__(self, client):
+        self.client = client
+        self.sections = client.collections.get("Section")
+        self.categories = client.collections.get("Category")
+
+    async def _fetch_all(self, collection) -> list:
+        return [obj async for obj in collection.iterator()]
+
+    async def get_tree(self, include_inactive: bool = False) -> CatalogTree:
+        """Get the sorted catalog tree, building it on a cache miss"""
+        tree = _tree_cache.get(include_inactive)
+        if tree is None:
+            tree = await self.build_tree(include_inactive)
+            _tree_cache.set(include_inactive, tree)
+        return tree
+
+    async def build_tree(self, include_inactive: bool = False) -> CatalogTree:
+        """Build the catalog tree from all sections and categories"""
+        try:
+            section_objs, category_objs = await asyncio.gather(
+                self._fetch_all(self.sections),
+                self._fetch_all(self.categories),
+            )
+        except Exception as e:
+            logger.error(f"Error building catalog tree: {e}")
+            raise DatabaseException(f"Failed to build catalog tree: {e!s}")
+
+        sections = {
+            str(obj.uuid): SectionNode(id=str(obj.uuid), **obj.properties)
+            for obj in section_objs
+        }
+        categories = {
+            str(obj.uuid): CategoryNode(id=str(obj.uuid), **obj.properties)
+            for obj in category_objs
+        }
+        if not include_inactive:
+            sections = {k: v for k, v in sections.items() if v.is_active}
+            categories = {k: v for k, v in categories.items() if v.is_active}
+
+        roots: list[SectionNode] = []
+        for section in sections.values():
+            parent = sections.get(section.parent_section_id or "")
+            if parent is not None and parent is not section:
+                parent.subsections.append(section)
+            elif not section.parent_section_id:
+                roots.append(section)
+
+        for category in categories.values():
+            parent = categories.get(category.parent_category_id or "")
+            if parent is not None and parent is not category:
+                parent.children.append(category)
+            elif not category.parent_category_id and category.section_id in sections:
+                sections[category.section_id].categories.append(category)
+
+        # Assign sorted children and breadcrumb paths top-down; nodes that only
+        # hang off inactive or missing parents are never reached
+        def visit_category(category: CategoryNode, path: list[CatalogBreadcrumb], seen: set[str]):
+            seen.add(category.id)
+            category.path = path
+            crumb = CatalogBreadcrumb(id=category.id, name=category.name, type="category")
+            category.children = sorted((c for c in category.children if c.id not in seen), key=_sort_key)
+            for child in category.children:
+                visit_category(child, [*path, crumb], seen)
+
+        def visit_section(section: SectionNode, path: list[CatalogBreadcrumb], seen: set[str]):
+            seen.add(section.id)
+            section.path = path
+            crumb = CatalogBreadcrumb(id=section.id, name=section.name, type="section")
+            section.subsections = sorted((s for s in section.subsections if s.id not in seen), key=_sort_key)
+            section.categories = sorted(section.categories, key=_sort_key)
+            for category in section.categories:
+                visit_category(category, [*path, crumb], seen)
+            for subsection in section.subsections:
+                visit_section(subsection, [*path, crumb], seen)
+
+        roots.sort(key=_sort_key)
+        seen: set[str] = set()
+        for root in roots:
+            visit_section(root, [], seen)
+
+        return CatalogTree(sections=roots, generated_at=datetime.utcnow().isoformat())
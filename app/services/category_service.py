@@ -1,8 +1,16 @@
+import asyncio
 from datetime import datetime
 
+from weaviate.classes.query import Filter
+
 from app.core.exceptions import DatabaseException, NotFoundException
 from app.core.logging import get_logger
+from app.db.aggregates import count_objects, invalidate_counts
+from app.db.mappers import category_mapper
+from app.db.writes import patch_object
 from app.models.category import Category, CategoryCreate, CategoryUpdate
+from app.services.catalog_service import invalidate_catalog_tree
+from app.services.suggest_index import suggest_index
 
 logger = get_logger(__name__)
 
@@ -14,7 +22,7 @@ class CategoryService:
         self.client = client
         self.collection = client.collections.get("Category")
 
-    def create_category(self, category: CategoryCreate) -> Category:
+    async def create_category(self, category: CategoryCreate) -> Category:
         """Create a new category"""
         try:
             now = datetime.utcnow().isoformat()
@@ -27,87 +35,90 @@ class CategoryService:
             category_dict["created_at"] = now
             category_dict["updated_at"] = now
 
-            uuid = self.collection.data.insert(category_dict)
+            uuid = await self.collection.data.insert(category_dict)
+            invalidate_counts("Category")
+            invalidate_catalog_tree()
+            suggest_index.set_category(uuid, category_dict["name"], category_dict["is_active"])
 
-            return Category(id=str(uuid), **category_dict)
+            return category_mapper.to_model(uuid, category_dict)
         except Exception as e:
             logger.error(f"Error creating category: {e}")
             raise DatabaseException(f"Failed to create category: {e!s}")
 
-    def get_category(self, category_id: str) -> Category:
+    async def get_category(self, category_id: str) -> Category:
         """Get category by ID"""
         try:
-            obj = self.collection.query.fetch_object_by_id(category_id)
+            obj = await self.collection.query.fetch_object_by_id(category_id)
 
             if not obj:
                 raise NotFoundException(f"Category with ID {category_id} not found")
 
-            return Category(id=str(obj.uuid), **obj.properties)
+            return category_mapper.from_object(obj)
         except NotFoundException:
             raise
         except Exception as e:
             logger.error(f"Error fetching category: {e}")
             raise DatabaseException(f"Failed to fetch category: {e!s}")
 
-    def list_categories(self, page: int = 1, page_size: int = 20, parent_id: str | None = None) -> tuple:
+    async def list_categories(self, page: int = 1, page_size: int = 20, parent_id: str | None = None) -> tuple:
         """List all categories with pagination"""
         try:
-            result = self.collection.query.fetch_objects(
-                limit=page_size,
-                offset=(page - 1) * page_size,
-            )
-
-            categories = [Category(id=str(obj.uuid), **obj.properties) for obj in result.objects]
-
-            # Filter by parent if specified
+            filters = None
             if parent_id is not None:
-                categories = [c for c in categories if c.parent_category_id == parent_id]
+                # Filter by parent category
+                filters = Filter.by_property("parent_category_id").equal(parent_id)
+
+            result, total = await asyncio.gather(
+                self.collection.query.fetch_objects(
+                    limit=page_size,
+                    offset=(page - 1) * page_size,
+                    filters=filters,
+                ),
+                count_objects(self.collection, filters, cache_key=(parent_id,)),
+            )
 
-            total = len(categories) + (page - 1) * page_size
-            if len(result.objects) == page_size:
-                total = page * page_size + 1
+            categories = [category_mapper.from_object(obj) for obj in result.objects]
 
             return categories, total
         except Exception as e:
             logger.error(f"Error listing categories: {e}")
             raise DatabaseException(f"Failed to list categories: {e!s}")
 
-    def update_category(self, category_id: str, category_update: CategoryUpdate) -> Category:
+    async def update_category(self, category_id: str, category_update: CategoryUpdate) -> Category:
         """Update category"""
         try:
-            existing = self.collection.query.fetch_object_by_id(category_id)
-            if not existing:
-                raise NotFoundException(f"Category with ID {category_id} not found")
-
             update_data = {k: v for k, v in category_update.model_dump().items() if v is not None}
 
             if not update_data:
-                return Category(id=category_id, **existing.properties)
+                return await self.get_category(category_id)
 
             update_data["updated_at"] = datetime.utcnow().isoformat()
 
-            self.collection.data.update(
-                uuid=category_id,
-                properties=update_data,
-            )
+            properties = await patch_object(self.collection, category_id, update_data)
+            if properties is None:
+                raise NotFoundException(f"Category with ID {category_id} not found")
+            invalidate_counts("Category")
+            invalidate_catalog_tree()
 
-            updated_obj = self.collection.query.fetch_object_by_id(category_id)
+            updated = category_mapper.to_model(category_id, properties)
+            suggest_index.set_category(category_id, updated.name, updated.is_active)
 
-            return Category(id=category_id, **updated_obj.properties)
+            return updated
         except NotFoundException:
             raise
         except Exception as e:
             logger.error(f"Error updating category: {e}")
             raise DatabaseException(f"Failed to update category: {e!s}")
 
-    def delete_category(self, category_id: str) -> bool:
+    async def delete_category(self, category_id: str) -> bool:
         """Delete category"""
         try:
-            existing = self.collection.query.fetch_object_by_id(category_id)
-            if not existing:
+            if not await self.collection.data.delete_by_id(category_id):
                 raise NotFoundException(f"Category with ID {category_id} not found")
 
-            self.collection.data.delete_by_id(category_id)
+            suggest_index.remove_category(category_id)
+            invalidate_counts("Category")
+            invalidate_catalog_tree()
             return True
         except NotFoundException:
             raise
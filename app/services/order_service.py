@@ -1,19 +1,52 @@
+import asyncio
 import json
 import random
 import string
+from collections.abc import AsyncIterator
 from datetime import datetime
-
-from app.core.exceptions import DatabaseException, NotFoundException
+from typing import Any
+from uuid import UUID
+
+from weaviate.classes.aggregate import GroupByAggregate
+from weaviate.classes.query import Filter, Metrics
+from weaviate.util import generate_uuid5
+
+from app.core.config import get_settings
+from app.core.exceptions import (
+    BadRequestException,
+    DatabaseException,
+    NotFoundException,
+)
 from app.core.logging import get_logger
+from app.db.aggregates import count_objects, invalidate_counts
+from app.db.mappers import order_mapper
+from app.db.pagination import build_next_cursor, build_page_query
+from app.db.writes import keyset_timestamp, patch_object, update_object
 from app.models.order import (
     Order,
     OrderCreate,
     OrderStatistics,
     OrderStatus,
+    OrderTransitionItem,
+    OrderTransitionResult,
     OrderUpdate,
 )
+from app.services.order_stats import order_stats_store
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+# Candidates read per query when looking up a legacy order by number
+NUMBER_LOOKUP_PAGE_SIZE = 20
+
+# Status changes accepted by bulk transitions; delivered and cancelled are final
+ORDER_STATUS_TRANSITIONS: dict[OrderStatus, set[OrderStatus]] = {
+    OrderStatus.PENDING: {OrderStatus.PROCESSING, OrderStatus.CANCELLED},
+    OrderStatus.PROCESSING: {OrderStatus.SHIPPED, OrderStatus.CANCELLED},
+    OrderStatus.SHIPPED: {OrderStatus.DELIVERED},
+    OrderStatus.DELIVERED: set(),
+    OrderStatus.CANCELLED: set(),
+}
 
 
 class OrderService:
@@ -29,7 +62,17 @@ class OrderService:
         random_str = "".join(random.choices(string.ascii_uppercase + string.digits, k=6))
         return f"ORD-{timestamp}-{random_str}"
 
-    def create_order(self, order: OrderCreate) -> Order:
+    @staticmethod
+    def _build_filters(status: OrderStatus | None = None, customer_email: str | None = None):
+        """Build a Weaviate filter expression for order listings"""
+        conditions = []
+        if status:
+            conditions.append(Filter.by_property("status").equal(status.value))
+        if customer_email:
+            conditions.append(Filter.by_property("customer_email").equal(customer_email))
+        return Filter.all_of(conditions) if conditions else None
+
+    async def create_order(self, order: OrderCreate) -> Order:
         """Create a new order"""
         try:
             now = datetime.utcnow().isoformat()
@@ -42,110 +85,118 @@ class OrderService:
 
             order_dict["order_number"] = self._generate_order_number()
             order_dict["created_at"] = now
+            order_dict["created_ts"] = keyset_timestamp(now)
             order_dict["updated_at"] = now
 
-            uuid = self.collection.data.insert(order_dict)
+            # Store under a UUID derived from the order number for point lookups
+            uuid = await self.collection.data.insert(
+                order_dict,
+                uuid=generate_uuid5(order_dict["order_number"]),
+            )
+            invalidate_counts("Order")
+            order_stats_store.record_created(OrderStatus(order_dict["status"]).value, order_dict["total"])
 
-            # Return with items deserialized
-            result_dict = order_dict.copy()
-            result_dict["items"] = items_list
-            result_dict.pop("items_json")
-            return Order(id=str(uuid), **result_dict)
+            return order_mapper.to_model(uuid, order_dict)
         except Exception as e:
             logger.error(f"Error creating order: {e}")
             raise DatabaseException(f"Failed to create order: {e!s}")
 
-    def get_order(self, order_id: str) -> Order:
+    async def get_order(self, order_id: str) -> Order:
         """Get order by ID"""
         try:
-            obj = self.collection.query.fetch_object_by_id(order_id)
+            obj = await self.collection.query.fetch_object_by_id(order_id)
 
             if not obj:
                 raise NotFoundException(f"Order with ID {order_id} not found")
 
-            props = obj.properties
-            # Deserialize items_json to items
-            if "items_json" in props:
-                props["items"] = json.loads(props.pop("items_json"))
-            return Order(id=str(obj.uuid), **props)
+            return order_mapper.from_object(obj)
         except NotFoundException:
             raise
         except Exception as e:
             logger.error(f"Error fetching order: {e}")
             raise DatabaseException(f"Failed to fetch order: {e!s}")
 
-    def get_order_by_number(self, order_number: str) -> Order:
+    async def get_order_by_number(self, order_number: str) -> Order:
         """Get order by order number"""
         try:
-            result = self.collection.query.fetch_objects(limit=100)
+            obj = await self.collection.query.fetch_object_by_id(generate_uuid5(order_number))
 
-            for obj in result.objects:
-                if obj.properties.get("order_number") == order_number:
-                    props = obj.properties
-                    # Deserialize items_json to items
-                    if "items_json" in props:
-                        props["items"] = json.loads(props.pop("items_json"))
-                    return Order(id=str(obj.uuid), **props)
+            if not obj or obj.properties.get("order_number") != order_number:
+                # Orders created before deterministic IDs have random UUIDs, and
+                # older collections match the number token by token, so page
+                # through the candidates for the exact one
+                obj = await self._find_by_number(order_number)
+
+            if not obj:
+                raise NotFoundException(f"Order with number {order_number} not found")
 
-            raise NotFoundException(f"Order with number {order_number} not found")
+            return order_mapper.from_object(obj)
         except NotFoundException:
             raise
         except Exception as e:
             logger.error(f"Error fetching order by number: {e}")
             raise DatabaseException(f"Failed to fetch order: {e!s}")
 
-    def list_orders(
+    async def _find_by_number(self, order_number: str):
+        """The order whose number is exactly order_number, paging through filter matches"""
+        offset = 0
+        while True:
+            result = await self.collection.query.fetch_objects(
+                filters=Filter.by_property("order_number").equal(order_number),
+                limit=NUMBER_LOOKUP_PAGE_SIZE,
+                offset=offset,
+            )
+            for obj in result.objects:
+                if obj.properties.get("order_number") == order_number:
+                    return obj
+            if len(result.objects) < NUMBER_LOOKUP_PAGE_SIZE:
+                return None
+            offset += NUMBER_LOOKUP_PAGE_SIZE
+
+    async def list_orders(
         self,
         page: int = 1,
         page_size: int = 20,
         status: OrderStatus | None = None,
         customer_email: str | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
     ) -> tuple:
-        """List orders with pagination and filters"""
+        """List orders with pagination and filters
+
+        When cursor is given, page is ignored and the page after the cursor is returned.
+        fields selects the slim grid view or a comma-separated field list.
+        """
         try:
-            result = self.collection.query.fetch_objects(
-                limit=page_size,
-                offset=(page - 1) * page_size,
+            mapper = order_mapper.select(fields)
+            filters = self._build_filters(status, customer_email)
+            query = build_page_query(
+                filters, page, page_size, cursor,
+                return_properties=mapper.properties if fields else None,
+            )
+            result, total = await asyncio.gather(
+                self.collection.query.fetch_objects(**query),
+                count_objects(self.collection, filters, cache_key=(status, customer_email)),
             )
 
-            orders = []
-            for obj in result.objects:
-                props = obj.properties
-                # Apply filters
-                if status and props.get("status") != status.value:
-                    continue
-                if customer_email and props.get("customer_email") != customer_email:
-                    continue
-
-                # Deserialize items_json to items
-                if "items_json" in props:
-                    props["items"] = json.loads(props.pop("items_json"))
-                orders.append(Order(id=str(obj.uuid), **props))
-
-            total = len(orders) + (page - 1) * page_size
-            if len(result.objects) == page_size:
-                total = page * page_size + 1
-
-            return orders, total
+            orders = [mapper.from_object(obj) for obj in result.objects]
+
+            next_cursor = build_next_cursor(result.objects, page_size, filters, cursor)
+
+            return orders, total, next_cursor
+        except BadRequestException:
+            raise
         except Exception as e:
             logger.error(f"Error listing orders: {e}")
             raise DatabaseException(f"Failed to list orders: {e!s}")
 
-    def update_order(self, order_id: str, order_update: OrderUpdate) -> Order:
+    async def update_order(self, order_id: str, order_update: OrderUpdate) -> Order:
         """Update order"""
         try:
-            existing = self.collection.query.fetch_object_by_id(order_id)
-            if not existing:
-                raise NotFoundException(f"Order with ID {order_id} not found")
-
             update_data = {k: v for k, v in order_update.model_dump().items() if v is not None}
 
             if not update_data:
-                props = existing.properties
-                # Deserialize items_json to items
-                if "items_json" in props:
-                    props["items"] = json.loads(props.pop("items_json"))
-                return Order(id=order_id, **props)
+                return await self.get_order(order_id)
 
             # Convert status enum to string if present
             if "status" in update_data:
@@ -158,32 +209,44 @@ class OrderService:
 
             update_data["updated_at"] = datetime.utcnow().isoformat()
 
-            self.collection.data.update(
-                uuid=order_id,
-                properties=update_data,
-            )
-
-            updated_obj = self.collection.query.fetch_object_by_id(order_id)
-
-            props = updated_obj.properties
-            # Deserialize items_json to items
-            if "items_json" in props:
-                props["items"] = json.loads(props.pop("items_json"))
-            return Order(id=order_id, **props)
+            if "status" in update_data:
+                # The statistics delta needs the status from before the write
+                existing = await self.collection.query.fetch_object_by_id(order_id)
+                if not existing:
+                    raise NotFoundException(f"Order with ID {order_id} not found")
+                if not await update_object(self.collection, order_id, update_data):
+                    raise NotFoundException(f"Order with ID {order_id} not found")
+                order_stats_store.record_status_change(
+                    existing.properties.get("status"),
+                    update_data["status"],
+                    existing.properties.get("total"),
+                )
+                properties = {**existing.properties, **update_data}
+            else:
+                properties = await patch_object(self.collection, order_id, update_data)
+                if properties is None:
+                    raise NotFoundException(f"Order with ID {order_id} not found")
+            invalidate_counts("Order")
+
+            return order_mapper.to_model(order_id, properties)
         except NotFoundException:
             raise
         except Exception as e:
             logger.error(f"Error updating order: {e}")
             raise DatabaseException(f"Failed to update order: {e!s}")
 
-    def delete_order(self, order_id: str) -> bool:
+    async def delete_order(self, order_id: str) -> bool:
         """Delete order"""
         try:
-            existing = self.collection.query.fetch_object_by_id(order_id)
-            if not existing:
+            # The statistics delta needs the status and total of the deleted order
+            existing = await self.collection.query.fetch_object_by_id(
+                order_id, return_properties=["status", "total"],
+            )
+            if not existing or not await self.collection.data.delete_by_id(order_id):
                 raise NotFoundException(f"Order with ID {order_id} not found")
 
-            self.collection.data.delete_by_id(order_id)
+            invalidate_counts("Order")
+            order_stats_store.record_deleted(existing.properties.get("status"), existing.properties.get("total"))
             return True
         except NotFoundException:
             raise
@@ -191,39 +254,225 @@ class OrderService:
             logger.error(f"Error deleting order: {e}")
             raise DatabaseException(f"Failed to delete order: {e!s}")
 
-    def get_statistics(self) -> OrderStatistics:
-        """Get order statistics"""
+    async def transition_orders(
+        self,
+        status: OrderStatus,
+        ids: list[str] | None = None,
+        order_numbers: list[str] | None = None,
+        notes: str | None = None,
+        batch_size: int = 200,
+    ) -> OrderTransitionResult:
+        """Move many orders to status in batched writes
+
+        Orders are resolved with one ID-filtered read per batch; order numbers map
+        to their deterministic UUIDs, with a filtered fallback for legacy orders.
+        Just before writing, the batch is read again and orders edited since the
+        first read fail rather than being moved on a stale check. Each order gets
+        a result entry, in request order (IDs, then numbers); an order listed
+        twice is only written once.
+        """
+        targets: list[tuple[str, str | None, str | None]] = []
+        for order_id in ids or []:
+            try:
+                targets.append((order_id, str(UUID(order_id)), None))
+            except ValueError:
+                targets.append((order_id, None, None))
+        for order_number in order_numbers or []:
+            targets.append((order_number, str(generate_uuid5(order_number)), order_number))
+
+        results: list[OrderTransitionItem | None] = [None] * len(targets)
+        claimed: set[str] = set()
         try:
-            result = self.collection.query.fetch_objects(limit=10000)
-
-            stats = {
-                "total_orders": 0,
-                "pending_orders": 0,
-                "processing_orders": 0,
-                "shipped_orders": 0,
-                "delivered_orders": 0,
-                "cancelled_orders": 0,
-                "total_revenue": 0.0,
-            }
+            for start in range(0, len(targets), batch_size):
+                await self._transition_batch(
+                    targets[start:start + batch_size], start, status, notes, results, claimed,
+                )
+        finally:
+            invalidate_counts("Order")
+
+        summary = OrderTransitionResult(requested=len(targets), results=results)
+        for item in results:
+            if item.result == "updated":
+                summary.updated += 1
+            elif item.result == "unchanged":
+                summary.unchanged += 1
+            else:
+                summary.failed += 1
+        return summary
+
+    async def _transition_batch(
+        self,
+        batch: list[tuple[str, str | None, str | None]],
+        offset: int,
+        status: OrderStatus,
+        notes: str | None,
+        results: list[OrderTransitionItem | None],
+        claimed: set[str],
+    ):
+        """Resolve, check and write one batch of status transitions"""
+        try:
+            found = await self._fetch_for_transition(batch)
+        except Exception as e:
+            logger.error(f"Error reading order transition batch: {e}")
+            for position, (key, _, _) in enumerate(batch):
+                results[offset + position] = OrderTransitionItem(
+                    key=key, result="failed", message=f"Batch read failed: {e!s}",
+                )
+            return
+
+        now = datetime.utcnow().isoformat()
+        writes: list[tuple[int, Any, str]] = []
+        for position, (key, uuid, order_number) in enumerate(batch):
+            obj = found.get(uuid)
+            if order_number and (obj is None or obj.properties.get("order_number") != order_number):
+                obj = found.get(order_number)
+            if obj is None:
+                results[offset + position] = OrderTransitionItem(key=key, result="not_found")
+                continue
+
+            order_id = str(obj.uuid)
+            try:
+                previous = OrderStatus(obj.properties.get("status")).value
+            except ValueError:
+                previous = obj.properties.get("status")
+            item = OrderTransitionItem(key=key, id=order_id, previous_status=previous, result="unchanged")
+            results[offset + position] = item
+            if previous == status.value or order_id in claimed:
+                continue
+
+            if status not in ORDER_STATUS_TRANSITIONS.get(previous, set()):
+                item.result = "invalid_transition"
+                item.message = f"Cannot change status from {previous} to {status.value}"
+                continue
+
+            claimed.add(order_id)
+            writes.append((offset + position, obj, previous))
+
+        if not writes:
+            return
 
+        try:
+            current = await self._fetch_current(writes)
+        except Exception as e:
+            logger.error(f"Error re-reading order transition batch: {e}")
+            for index, _, _ in writes:
+                results[index].result = "failed"
+                results[index].message = f"Batch read failed: {e!s}"
+            return
+
+        changes = {"status": status.value, "updated_at": now}
+        if notes is not None:
+            changes["notes"] = notes
+        pending = []
+        for index, obj, previous in writes:
+            latest = current.get(str(obj.uuid))
+            if latest is None or latest.properties.get("updated_at") != obj.properties.get("updated_at"):
+                # Checked against a stale row; leave the newer edit alone
+                results[index].result = "failed"
+                results[index].message = "Order changed during the transition; retry it"
+                continue
+            pending.append((index, obj, previous))
+
+        # Only the status fields are sent, so other fields are never overwritten
+        outcomes = await asyncio.gather(
+            *(update_object(self.collection, str(obj.uuid), changes) for _, obj, _ in pending),
+            return_exceptions=True,
+        )
+        for (index, obj, previous), outcome in zip(pending, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error writing order transition {obj.uuid}: {outcome}")
+                results[index].result = "failed"
+                results[index].message = f"Write failed: {outcome!s}"
+                continue
+            if outcome is not True:
+                results[index].result = "not_found"
+                continue
+            results[index].result = "updated"
+            order_stats_store.record_status_change(previous, status.value, obj.properties.get("total"))
+
+    async def _fetch_current(self, writes: list[tuple[int, Any, str]]) -> dict[str, Any]:
+        """Re-read the status and updated_at of orders about to be written, keyed by UUID"""
+        uuids = [str(obj.uuid) for _, obj, _ in writes]
+        result = await self.collection.query.fetch_objects(
+            filters=Filter.by_id().contains_any(uuids),
+            limit=len(uuids),
+            return_properties=["status", "updated_at"],
+        )
+        return {str(obj.uuid): obj for obj in result.objects}
+
+    async def _fetch_for_transition(self, batch: list[tuple[str, str | None, str | None]]) -> dict[str, Any]:
+        """Fetch the orders of a batch, keyed by UUID and, for legacy rows, order number"""
+        uuids = list({uuid for _, uuid, _ in batch if uuid})
+        found: dict[str, Any] = {}
+        if uuids:
+            result = await self.collection.query.fetch_objects(
+                filters=Filter.by_id().contains_any(uuids),
+                limit=len(uuids),
+            )
+            found = {str(obj.uuid): obj for obj in result.objects}
+
+        # Orders created before deterministic IDs have random UUIDs
+        legacy = list({
+            order_number for _, uuid, order_number in batch
+            if order_number and (uuid not in found or found[uuid].properties.get("order_number") != order_number)
+        })
+        if legacy:
+            result = await self.collection.query.fetch_objects(
+                filters=Filter.by_property("order_number").contains_any(legacy),
+                limit=len(legacy) * 2,
+            )
             for obj in result.objects:
-                props = obj.properties
-                stats["total_orders"] += 1
-
-                status = props.get("status", "")
-                if status == OrderStatus.PENDING.value:
-                    stats["pending_orders"] += 1
-                elif status == OrderStatus.PROCESSING.value:
-                    stats["processing_orders"] += 1
-                elif status == OrderStatus.SHIPPED.value:
-                    stats["shipped_orders"] += 1
-                elif status == OrderStatus.DELIVERED.value:
-                    stats["delivered_orders"] += 1
-                    stats["total_revenue"] += props.get("total", 0)
-                elif status == OrderStatus.CANCELLED.value:
-                    stats["cancelled_orders"] += 1
-
-            return OrderStatistics(**stats)
+                if obj.properties.get("order_number") in legacy:
+                    found[obj.properties["order_number"]] = obj
+        return found
+
+    async def export_orders(self, page_size: int = 1000) -> AsyncIterator[dict[str, Any]]:
+        """Stream every order using Weaviate's cursor iterator"""
+        try:
+            async for obj in self.collection.iterator(cache_size=page_size):
+                yield order_mapper.to_dict(obj.uuid, obj.properties)
+        except Exception as e:
+            logger.error(f"Error exporting orders: {e}")
+            raise
+
+    async def get_statistics(self) -> OrderStatistics:
+        """Get order statistics from the incrementally maintained store"""
+        return await order_stats_store.get(self.client, self.compute_statistics)
+
+    async def reconcile_statistics(self) -> OrderStatistics:
+        """Rebuild the statistics store from Weaviate to repair drift
+
+        Skipped if another worker rebuilt it within the reconcile interval.
+        """
+        return await order_stats_store.refresh(
+            self.client, self.compute_statistics, max_age=settings.ORDER_STATS_RECONCILE_INTERVAL / 2,
+        )
+
+    async def compute_statistics(self) -> OrderStatistics:
+        """Compute order statistics with Weaviate aggregate queries"""
+        try:
+            by_status, delivered = await asyncio.gather(
+                self.collection.aggregate.over_all(
+                    group_by=GroupByAggregate(prop="status"),
+                    total_count=True,
+                ),
+                self.collection.aggregate.over_all(
+                    filters=Filter.by_property("status").equal(OrderStatus.DELIVERED.value),
+                    return_metrics=Metrics("total").number(sum_=True),
+                ),
+            )
+
+            counts = {group.grouped_by.value: group.total_count or 0 for group in by_status.groups}
+
+            return OrderStatistics(
+                total_orders=sum(counts.values()),
+                pending_orders=counts.get(OrderStatus.PENDING.value, 0),
+                processing_orders=counts.get(OrderStatus.PROCESSING.value, 0),
+                shipped_orders=counts.get(OrderStatus.SHIPPED.value, 0),
+                delivered_orders=counts.get(OrderStatus.DELIVERED.value, 0),
+                cancelled_orders=counts.get(OrderStatus.CANCELLED.value, 0),
+                total_revenue=delivered.properties["total"].sum_ or 0.0,
+            )
         except Exception as e:
             logger.error(f"Error getting order statistics: {e}")
             raise DatabaseException(f"Failed to get order statistics: {e!s}")
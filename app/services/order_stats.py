@@ -0,0 +1,204 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from uuid import uuid4
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.shared_state import SharedValue, delete_shared_values, read_shared_values
+from app.models.order import OrderStatistics, OrderStatus
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+DELTA_PREFIX = "order_stats_delta"
+
+
+class _Delta:
+    """Order counts by status and delivered revenue; "" counts unknown statuses"""
+
+    def __init__(self, counts: dict[str, int] | None = None, revenue: float = 0.0):
+        self.counts = dict(counts or {})
+        self.revenue = revenue
+
+    @classmethod
+    def from_statistics(cls, stats: OrderStatistics) -> "_Delta":
+        counts = {
+            OrderStatus.PENDING.value: stats.pending_orders,
+            OrderStatus.PROCESSING.value: stats.processing_orders,
+            OrderStatus.SHIPPED.value: stats.shipped_orders,
+            OrderStatus.DELIVERED.value: stats.delivered_orders,
+            OrderStatus.CANCELLED.value: stats.cancelled_orders,
+        }
+        # Orders with an unrecognised status still count towards the total
+        counts[""] = stats.total_orders - sum(counts.values())
+        return cls(counts, stats.total_revenue)
+
+    @classmethod
+    def from_value(cls, value: dict | None) -> "_Delta":
+        value = value or {}
+        return cls(value.get("counts"), value.get("revenue", 0.0))
+
+    def to_value(self) -> dict:
+        return {"counts": self.counts, "revenue": self.revenue}
+
+    def apply(self, status: str | None, total: float | None, sign: int):
+        key = status if status in OrderStatus._value2member_map_ else ""
+        self.counts[key] = self.counts.get(key, 0) + sign
+        if status == OrderStatus.DELIVERED.value:
+            self.revenue += sign * (total or 0.0)
+
+    def add(self, other: "_Delta") -> "_Delta":
+        counts = dict(self.counts)
+        for key, count in other.counts.items():
+            counts[key] = counts.get(key, 0) + count
+        return _Delta(counts, self.revenue + other.revenue)
+
+    def subtract(self, other: "_Delta") -> "_Delta":
+        return self.add(_Delta({key: -count for key, count in other.counts.items()}, -other.revenue))
+
+    def __bool__(self) -> bool:
+        return any(self.counts.values()) or bool(self.revenue)
+
+    def to_statistics(self) -> OrderStatistics:
+        counts = self.counts
+        return OrderStatistics(
+            total_orders=sum(counts.values()),
+            pending_orders=counts.get(OrderStatus.PENDING.value, 0),
+            processing_orders=counts.get(OrderStatus.PROCESSING.value, 0),
+            shipped_orders=counts.get(OrderStatus.SHIPPED.value, 0),
+            delivered_orders=counts.get(OrderStatus.DELIVERED.value, 0),
+            cancelled_orders=counts.get(OrderStatus.CANCELLED.value, 0),
+            total_revenue=round(self.revenue, 2),
+        )
+
+
+class OrderStatsStore:
+    """Order statistics maintained from write deltas and shared by every worker
+
+    The shared statistics are a base computed with aggregate queries, tagged
+    with an epoch, plus one running delta per worker for that epoch. Order
+    writes apply their delta (a status count +/-1, delivered revenue +/- the
+    order total) to this worker's pending delta in memory, and a background
+    flush publishes it, so writes never wait on SharedState. A read adds up the
+    base, the published deltas of every worker and this worker's unpublished
+    one, re-reading the shared part at most every SHARED_STATE_TTL seconds.
+
+    Only the periodic reconciliation recomputes the base, under a new epoch
+    that retires the old deltas. Another worker's deltas recorded while it runs
+    may be counted twice or not at all until the next reconciliation.
+    """
+
+    def __init__(self):
+        self.worker = uuid4().hex
+        self._base = SharedValue("order_stats", ttl=settings.SHARED_STATE_TTL)
+        # Epoch this worker's deltas belong to, what it published for that
+        # epoch, and what it recorded since
+        self._epoch: str | None = None
+        self._published = _Delta()
+        self._pending = _Delta()
+        # Other workers' published deltas, cached until _deltas_expires
+        self._deltas: dict[str, _Delta] = {}
+        self._deltas_epoch: str | None = None
+        self._deltas_expires = 0.0
+        self._refresh_lock = asyncio.Lock()
+
+    def record_created(self, status: str, total: float) -> None:
+        """Apply the delta for a new order"""
+        self._pending.apply(status, total, 1)
+
+    def record_deleted(self, status: str, total: float) -> None:
+        """Apply the delta for a deleted order"""
+        self._pending.apply(status, total, -1)
+
+    def record_status_change(self, old_status: str, new_status: str, total: float) -> None:
+        """Apply the delta for an order moving between statuses"""
+        if old_status == new_status:
+            return
+        self._pending.apply(old_status, total, -1)
+        self._pending.apply(new_status, total, 1)
+
+    async def flush(self, client) -> None:
+        """Publish this worker's running delta for the current epoch"""
+        base = await self._base.get(client)
+        if base is None:
+            # Nothing to add to yet; the first read computes the base
+            return
+        if base["epoch"] != self._epoch:
+            # What was published belonged to the retired epoch
+            self._epoch, self._published = base["epoch"], _Delta()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, _Delta()
+        running = self._published.add(pending)
+        try:
+            await SharedValue(self._delta_name(self._epoch), ttl=0).set(client, running.to_value())
+        except Exception:
+            self._pending = self._pending.add(pending)
+            raise
+        self._published = running
+
+    async def get(self, client, compute: Callable[[], Awaitable[OrderStatistics]]) -> OrderStatistics:
+        """Current statistics: the shared base plus every worker's deltas"""
+        base = await self._base.get(client)
+        if base is None:
+            return await self.refresh(client, compute, max_age=settings.ORDER_STATS_RECONCILE_INTERVAL)
+        epoch = base["epoch"]
+
+        if self._deltas_epoch != epoch or time.monotonic() >= self._deltas_expires:
+            values = await read_shared_values(client, self._delta_name(epoch, ""))
+            self._deltas = {name: _Delta.from_value(value) for name, value in values.items()}
+            self._deltas_epoch = epoch
+            self._deltas_expires = time.monotonic() + settings.SHARED_STATE_TTL
+
+        total = _Delta.from_value(base["stats"])
+        own = self._delta_name(epoch)
+        for name, delta in self._deltas.items():
+            if name != own:
+                total = total.add(delta)
+        if self._epoch == epoch:
+            total = total.add(self._published)
+        return total.add(self._pending).to_statistics()
+
+    async def refresh(
+        self,
+        client,
+        compute: Callable[[], Awaitable[OrderStatistics]],
+        max_age: float | None = None,
+    ) -> OrderStatistics:
+        """Recompute the base with compute and start a new epoch
+
+        With max_age, a base computed less than max_age seconds ago (by any
+        worker) is kept.
+        """
+        async with self._refresh_lock:
+            base = await self._base.get(client, fresh=True)
+            if base is not None and max_age is not None and time.time() - base.get("computed_at", 0) < max_age:
+                return await self.get(client, compute)
+            return await self._recompute(client, base, compute)
+
+    async def _recompute(self, client, base: dict | None, compute) -> OrderStatistics:
+        # This worker's deltas recorded before the aggregates run are part of them
+        included = _Delta(self._pending.counts, self._pending.revenue)
+        stats = await compute()
+        epoch = uuid4().hex
+        await self._base.set(client, {
+            "epoch": epoch,
+            "computed_at": time.time(),
+            "stats": _Delta.from_statistics(stats).to_value(),
+        })
+        self._epoch, self._published = epoch, _Delta()
+        self._pending = self._pending.subtract(included)
+        if base is not None:
+            try:
+                await delete_shared_values(client, self._delta_name(base["epoch"], ""))
+            except Exception as e:
+                logger.warning(f"Failed to delete retired order statistics deltas: {e}")
+        return stats
+
+    def _delta_name(self, epoch: str | None, worker: str | None = None) -> str:
+        return f"{DELTA_PREFIX}:{epoch}:{self.worker if worker is None else worker}"
+
+
+# Global instance
+order_stats_store = OrderStatsStore()
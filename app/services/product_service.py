@@ -1,11 +1,99 @@
+import asyncio
 import json
+from collections.abc import AsyncIterable, AsyncIterator
 from datetime import datetime
+from typing import Any
+from uuid import UUID, uuid4
 
-from app.core.exceptions import DatabaseException, NotFoundException
+from pydantic import ValidationError
+from weaviate.classes.config import Tokenization
+from weaviate.classes.data import DataObject
+from weaviate.classes.query import Filter, MetadataQuery
+from weaviate.util import generate_uuid5
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.exceptions import (
+    BadRequestException,
+    ConflictException,
+    DatabaseException,
+    NotFoundException,
+)
 from app.core.logging import get_logger
-from app.models.product import Product, ProductCreate, ProductUpdate
+from app.db.aggregates import count_objects, invalidate_counts
+from app.db.mappers import product_mapper
+from app.db.pagination import (
+    build_next_cursor,
+    build_offset_cursor,
+    build_page_query,
+    decode_offset_cursor,
+    query_fingerprint,
+)
+from app.db.shared_state import SharedValue
+from app.db.writes import (
+    batch_timestamps,
+    content_hash,
+    is_already_exists,
+    keyset_timestamp,
+    stored_hash,
+    update_object,
+)
+from app.models.common import BulkItemError, BulkOperationResult, SearchHit
+from app.models.product import (
+    Product,
+    ProductCreate,
+    ProductImportResult,
+    ProductPatchItem,
+    ProductSelector,
+    ProductSuggestion,
+    ProductSyncResult,
+    ProductUpdate,
+)
+from app.services.query_vectors import normalize_query, query_vector_cache
+from app.services.suggest_index import suggest_index
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+# Keyword side of hybrid search; exact SKU and name matches weigh the most
+SEARCH_PROPERTIES = ["sku^3", "name^2", "description", "attributes_json"]
+
+# Search results keyed by catalog version and query; product writes bump the
+# version so stale entries are never read again and age out of the LRU. The
+# version is shared, so a write in any worker or script retires every worker's
+# entries within SHARED_STATE_TTL
+_search_cache = TTLCache(maxsize=settings.SEARCH_CACHE_MAX_ENTRIES, ttl=settings.SEARCH_CACHE_TTL)
+catalog_version = SharedValue("catalog_version", ttl=settings.SHARED_STATE_TTL)
+
+
+async def bump_catalog_version(client) -> None:
+    """Invalidate cached search results in every process after a product write"""
+    try:
+        await catalog_version.set(client, uuid4().hex)
+    except Exception as e:
+        # The write itself went through; other workers catch up when their entries expire
+        logger.warning(f"Failed to publish catalog version: {e}")
+        _search_cache.clear()
+
+
+# (slug|sku, value) -> product UUID; every hit is checked against the fetched
+# row, so keys changed or deleted since fall back to the filtered lookup
+_key_index = TTLCache(maxsize=settings.PRODUCT_KEY_CACHE_MAX_ENTRIES)
+UNIQUE_KEYS = ("slug", "sku")
+KEY_LOOKUP_PAGE_SIZE = 100
+# Single-SKU lookups in flight per batch where sku is not field tokenized
+KEY_LOOKUP_CONCURRENCY = 8
+# Property -> whether it is field tokenized, read once from the collection
+# config; only then does contains_any match whole values
+_field_tokenized: dict[str, bool] = {}
+# IDs read per query when snapshotting the products a filtered update targets
+SNAPSHOT_PAGE_SIZE = 1000
+
+
+def _remember_keys(product_id, properties: dict[str, Any]) -> None:
+    for key in UNIQUE_KEYS:
+        if properties.get(key):
+            _key_index.set((key, properties[key]), str(product_id))
 
 
 class ProductService:
@@ -15,55 +103,322 @@ class ProductService:
         self.client = client
         self.collection = client.collections.get("Product")
 
-    def create_product(self, product: ProductCreate) -> Product:
-        """Create a new product"""
-        try:
-            now = datetime.utcnow().isoformat()
-            product_dict = product.model_dump()
+    @staticmethod
+    def _build_filters(
+        category_id: str | None = None,
+        section_id: str | None = None,
+        is_active: bool | None = None,
+        featured: bool | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+    ):
+        """Build a Weaviate filter expression for product listings"""
+        conditions = []
+        if category_id:
+            conditions.append(Filter.by_property("category_id").equal(category_id))
+        if section_id:
+            conditions.append(Filter.by_property("section_id").equal(section_id))
+        if is_active is not None:
+            conditions.append(Filter.by_property("is_active").equal(is_active))
+        if featured is not None:
+            conditions.append(Filter.by_property("featured").equal(featured))
+        if min_price is not None:
+            conditions.append(Filter.by_property("price").greater_or_equal(min_price))
+        if max_price is not None:
+            conditions.append(Filter.by_property("price").less_or_equal(max_price))
+        return Filter.all_of(conditions) if conditions else None
+
+    @staticmethod
+    def _to_properties(product: ProductCreate, now: str) -> dict[str, Any]:
+        """Convert a product model to stored Weaviate properties"""
+        product_dict = product.model_dump()
+
+        # Generate slug if not provided
+        if not product_dict.get("slug"):
+            product_dict["slug"] = product_dict["name"].lower().replace(" ", "-")
 
-            # Generate slug if not provided
-            if not product_dict.get("slug"):
-                product_dict["slug"] = product_dict["name"].lower().replace(" ", "-")
+        # Convert attributes dict to JSON string
+        if "attributes" in product_dict:
+            product_dict["attributes_json"] = json.dumps(product_dict.pop("attributes"))
 
-            # Convert attributes dict to JSON string
-            if "attributes" in product_dict:
-                product_dict["attributes_json"] = json.dumps(product_dict.pop("attributes"))
+        product_dict["created_at"] = now
+        product_dict["created_ts"] = keyset_timestamp(now)
+        product_dict["updated_at"] = now
+        return product_dict
 
-            product_dict["created_at"] = now
-            product_dict["updated_at"] = now
+    @staticmethod
+    def _patch_properties(product_update: ProductUpdate) -> dict[str, Any]:
+        """Stored properties changed by a partial product update"""
+        update_data = {
+            k: v for k, v in product_update.model_dump(exclude={"id"}).items() if v is not None
+        }
 
-            uuid = self.collection.data.insert(product_dict)
+        # Convert attributes dict to JSON string if present
+        if "attributes" in update_data:
+            update_data["attributes_json"] = json.dumps(update_data.pop("attributes"))
+        return update_data
 
-            # Return with attributes as dict
-            result_dict = product_dict.copy()
-            if "attributes_json" in result_dict:
-                result_dict["attributes"] = json.loads(result_dict.pop("attributes_json"))
+    def _selector_filters(self, selector: ProductSelector):
+        """Build the filter for the products a bulk operation targets"""
+        filters = self._build_filters(
+            selector.category_id,
+            selector.section_id,
+            selector.is_active,
+            selector.featured,
+            selector.min_price,
+            selector.max_price,
+        )
+        if not selector.ids:
+            return filters
 
-            return Product(id=str(uuid), **result_dict)
+        try:
+            ids = [str(UUID(product_id)) for product_id in selector.ids]
+        except ValueError:
+            raise BadRequestException("ids must be product UUIDs")
+        id_filter = Filter.by_id().contains_any(ids)
+        return id_filter if filters is None else Filter.all_of([filters, id_filter])
+
+    async def create_product(self, product: ProductCreate) -> Product:
+        """Create a new product"""
+        try:
+            now = datetime.utcnow().isoformat()
+            product_dict = self._to_properties(product, now)
+            await self._ensure_unique(None, product.slug, product.sku)
+            if not product.slug:
+                product_dict["slug"] = (await self._free_slugs([product_dict["slug"]]))[0]
+            product_dict["content_hash"] = content_hash(product_dict)
+
+            uuid = await self._insert_keyed(product_dict)
+            invalidate_counts("Product")
+            await bump_catalog_version(self.client)
+            _remember_keys(uuid, product_dict)
+
+            suggest_index.set_product(uuid, product_dict["name"], product_dict["sku"], product_dict["is_active"])
+
+            return product_mapper.to_model(uuid, product_dict)
+        except ConflictException:
+            raise
         except Exception as e:
             logger.error(f"Error creating product: {e}")
             raise DatabaseException(f"Failed to create product: {e!s}")
 
-    def get_product(self, product_id: str) -> Product:
+    async def _insert_keyed(self, properties: dict[str, Any]):
+        """Insert a product at the UUID derived from its SKU
+
+        Two creates racing on one SKU target the same UUID, so the second
+        insert fails and is reported as a conflict. A UUID held by a product
+        whose SKU has since changed is left alone and the new one gets a
+        random UUID.
+        """
+        sku = properties.get("sku")
+        if not sku:
+            return await self.collection.data.insert(properties)
+        try:
+            return await self.collection.data.insert(properties, uuid=generate_uuid5(sku))
+        except Exception as e:
+            if not is_already_exists(e):
+                raise
+        occupant = await self.collection.query.fetch_object_by_id(generate_uuid5(sku), return_properties=["sku"])
+        if occupant is None or occupant.properties.get("sku") == sku:
+            raise ConflictException(f"Product with sku '{sku}' already exists")
+        return await self.collection.data.insert(properties)
+
+    async def get_product(self, product_id: str) -> Product:
         """Get product by ID"""
         try:
-            obj = self.collection.query.fetch_object_by_id(product_id)
+            obj = await self.collection.query.fetch_object_by_id(product_id)
 
             if not obj:
                 raise NotFoundException(f"Product with ID {product_id} not found")
 
-            props = {k: str(v) if hasattr(v, "hex") else v for k, v in obj.properties.items()}
-            # Deserialize attributes_json to attributes
-            if "attributes_json" in props:
-                props["attributes"] = json.loads(props.pop("attributes_json"))
-            return Product(id=str(obj.uuid), **props)
+            return product_mapper.from_object(obj)
         except NotFoundException:
             raise
         except Exception as e:
             logger.error(f"Error fetching product: {e}")
             raise DatabaseException(f"Failed to fetch product: {e!s}")
 
-    def list_products(
+    async def get_products_by_ids(self, ids: list[str], fields: str | None = None) -> tuple[list, list[str]]:
+        """Get many products with one ID filter
+
+        Returns the products in request order, without duplicates, and the
+        requested IDs that do not exist or are not valid UUIDs.
+        """
+        try:
+            mapper = product_mapper.select(fields)
+            keys: dict[str, str | None] = {}
+            for product_id in ids:
+                try:
+                    keys[product_id] = str(UUID(product_id))
+                except ValueError:
+                    keys[product_id] = None
+            wanted = list(dict.fromkeys(key for key in keys.values() if key))
+
+            found = {}
+            if wanted:
+                result = await self.collection.query.fetch_objects(
+                    filters=Filter.by_id().contains_any(wanted),
+                    limit=len(wanted),
+                    return_properties=mapper.properties if fields else None,
+                )
+                found = {str(obj.uuid): obj for obj in result.objects}
+
+            products = []
+            missing = []
+            returned = set()
+            for product_id, key in keys.items():
+                obj = found.get(key)
+                if obj is None:
+                    missing.append(product_id)
+                elif key not in returned:
+                    returned.add(key)
+                    products.append(mapper.from_object(obj))
+            return products, missing
+        except BadRequestException:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching products by ID: {e}")
+            raise DatabaseException(f"Failed to fetch products: {e!s}")
+
+    async def get_product_by_slug(self, slug: str) -> Product:
+        """Get product by slug"""
+        return await self._get_by_key("slug", slug)
+
+    async def get_product_by_sku(self, sku: str) -> Product:
+        """Get product by SKU"""
+        return await self._get_by_key("sku", sku)
+
+    async def _get_by_key(self, key: str, value: str) -> Product:
+        try:
+            obj = await self._find_by_key(key, value)
+
+            if not obj:
+                raise NotFoundException(f"Product with {key} {value} not found")
+
+            return product_mapper.from_object(obj)
+        except NotFoundException:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching product by {key}: {e}")
+            raise DatabaseException(f"Failed to fetch product: {e!s}")
+
+    async def _find_by_key(self, key: str, value: str, return_properties: list[str] | None = None):
+        """Resolve a product by a unique key: a point read on a map hit, else a filtered query"""
+        product_id = _key_index.get((key, value))
+        if product_id:
+            obj = await self.collection.query.fetch_object_by_id(product_id, return_properties=return_properties)
+            if obj and obj.properties.get(key) == value:
+                return obj
+            _key_index.invalidate((key, value))
+
+        # Collections created before field tokenization match text filters on
+        # tokens, so page through every candidate and confirm the exact value
+        async for obj in self._fetch_all(Filter.by_property(key).equal(value), return_properties):
+            if obj.properties.get(key) == value:
+                _key_index.set((key, value), str(obj.uuid))
+                return obj
+        return None
+
+    async def _fetch_all(self, filters, return_properties: list[str] | None = None, page_size: int = KEY_LOOKUP_PAGE_SIZE):
+        """Every product matching filters, read page by page"""
+        offset = 0
+        while True:
+            result = await self.collection.query.fetch_objects(
+                filters=filters,
+                limit=page_size,
+                offset=offset,
+                return_properties=return_properties,
+            )
+            for obj in result.objects:
+                yield obj
+            if len(result.objects) < page_size:
+                return
+            offset += page_size
+
+    async def _is_field_tokenized(self, key: str) -> bool:
+        """Whether key is indexed as one whole-value token"""
+        if not _field_tokenized:
+            config = await self.collection.config.get()
+            _field_tokenized.update(
+                (prop.name, prop.tokenization == Tokenization.FIELD) for prop in config.properties
+            )
+        return _field_tokenized.get(key, False)
+
+    async def _find_by_skus(self, skus: list[str], return_properties: list[str] | None = None) -> dict[str, Any]:
+        """Existing products of a batch of SKUs, keyed by their exact SKU
+
+        Products written by imports and syncs live at the UUID derived from
+        their SKU, so one ID-filtered read resolves most of a batch. The rest
+        take one contains_any query where sku is field tokenized, and bounded
+        single-SKU lookups on older collections.
+        """
+        by_uuid = {str(generate_uuid5(sku)): sku for sku in skus}
+        result = await self.collection.query.fetch_objects(
+            filters=Filter.by_id().contains_any(list(by_uuid)),
+            limit=len(by_uuid),
+            return_properties=return_properties,
+        )
+        found = {
+            obj.properties.get("sku"): obj
+            for obj in result.objects
+            if obj.properties.get("sku") == by_uuid.get(str(obj.uuid))
+        }
+        missing = [sku for sku in by_uuid.values() if sku not in found]
+        if not missing:
+            return found
+
+        if await self._is_field_tokenized("sku"):
+            wanted = set(missing)
+            async for obj in self._fetch_all(Filter.by_property("sku").contains_any(missing), return_properties):
+                sku = obj.properties.get("sku")
+                if sku in wanted and sku not in found:
+                    found[sku] = obj
+                    _key_index.set(("sku", sku), str(obj.uuid))
+            return found
+
+        semaphore = asyncio.Semaphore(KEY_LOOKUP_CONCURRENCY)
+
+        async def lookup(sku: str):
+            async with semaphore:
+                return await self._find_by_key("sku", sku, return_properties)
+
+        matches = await asyncio.gather(*(lookup(sku) for sku in missing))
+        found.update((sku, obj) for sku, obj in zip(missing, matches) if obj)
+        return found
+
+    async def _ensure_unique(self, product_id: str | None, slug: str | None, sku: str | None):
+        """Raise ConflictException if another product already uses slug or sku"""
+        for key, value in (("slug", slug), ("sku", sku)):
+            if not value:
+                continue
+            obj = await self._find_by_key(key, value)
+            if obj and str(obj.uuid) != product_id:
+                raise ConflictException(f"Product with {key} '{value}' already exists")
+
+    async def _free_slugs(self, bases: list[str]) -> list[str]:
+        """A distinct free slug for each base: the first of base, base-2, base-3, ... not in use
+
+        The slugs in use that equal or extend any of the bases are read with
+        one filtered query, however many bases there are.
+        """
+        if not bases:
+            return []
+        unique = list(dict.fromkeys(bases))
+        filters = Filter.any_of([
+            Filter.by_property("slug").contains_any(unique),
+            *(Filter.by_property("slug").like(f"{base}-*") for base in unique),
+        ])
+        taken = {obj.properties.get("slug") async for obj in self._fetch_all(filters, ["slug"], page_size=1000)}
+        slugs = []
+        for base in bases:
+            slug, suffix = base, 2
+            while slug in taken:
+                slug, suffix = f"{base}-{suffix}", suffix + 1
+            taken.add(slug)
+            slugs.append(slug)
+        return slugs
+
+    async def list_products(
         self,
         page: int = 1,
         page_size: int = 20,
@@ -71,91 +426,94 @@ class ProductService:
         section_id: str | None = None,
         is_active: bool | None = None,
         featured: bool | None = None,
+        cursor: str | None = None,
+        fields: str | None = None,
     ) -> tuple:
-        """List products with pagination and filters"""
+        """List products with pagination and filters
+
+        When cursor is given, page is ignored and the page after the cursor is returned.
+        fields selects a slim view (grid, card) or a comma-separated field list.
+        """
         try:
-            result = self.collection.query.fetch_objects(
-                limit=page_size,
-                offset=(page - 1) * page_size,
+            mapper = product_mapper.select(fields)
+            filters = self._build_filters(category_id, section_id, is_active, featured)
+            query = build_page_query(
+                filters, page, page_size, cursor,
+                return_properties=mapper.properties if fields else None,
+            )
+            result, total = await asyncio.gather(
+                self.collection.query.fetch_objects(**query),
+                count_objects(
+                    self.collection,
+                    filters,
+                    cache_key=(category_id, section_id, is_active, featured),
+                ),
             )
 
-            products = []
-            for obj in result.objects:
-                props = obj.properties
-                # Apply filters
-                if category_id and props.get("category_id") != category_id:
-                    continue
-                if section_id and props.get("section_id") != section_id:
-                    continue
-                if is_active is not None and props.get("is_active") != is_active:
-                    continue
-                if featured is not None and props.get("featured") != featured:
-                    continue
-
-                # Convert UUID fields to strings
-                props = {k: str(v) if hasattr(v, "hex") else v for k, v in props.items()}
-                # Deserialize attributes_json to attributes
-                if "attributes_json" in props:
-                    props["attributes"] = json.loads(props.pop("attributes_json"))
-                products.append(Product(id=str(obj.uuid), **props))
+            products = [mapper.from_object(obj) for obj in result.objects]
 
-            total = len(products) + (page - 1) * page_size
-            if len(result.objects) == page_size:
-                total = page * page_size + 1
+            next_cursor = build_next_cursor(result.objects, page_size, filters, cursor)
 
-            return products, total
+            return products, total, next_cursor
+        except BadRequestException:
+            raise
         except Exception as e:
             logger.error(f"Error listing products: {e}")
             raise DatabaseException(f"Failed to list products: {e!s}")
 
-    def update_product(self, product_id: str, product_update: ProductUpdate) -> Product:
-        """Update product"""
+    async def update_product(self, product_id: str, product_update: ProductUpdate) -> Product:
+        """Update product
+
+        A patch that leaves every stored property as it is (an unchanged
+        re-save) is not written, so updated_at stays put and Weaviate does not
+        re-vectorize the product.
+        """
         try:
-            existing = self.collection.query.fetch_object_by_id(product_id)
+            update_data = self._patch_properties(product_update)
+
+            existing = await self.collection.query.fetch_object_by_id(product_id)
             if not existing:
                 raise NotFoundException(f"Product with ID {product_id} not found")
 
-            update_data = {k: v for k, v in product_update.model_dump().items() if v is not None}
-
-            if not update_data:
-                props = {k: str(v) if hasattr(v, "hex") else v for k, v in existing.properties.items()}
-                # Deserialize attributes_json to attributes
-                if "attributes_json" in props:
-                    props["attributes"] = json.loads(props.pop("attributes_json"))
-                return Product(id=product_id, **props)
+            digest = content_hash({**existing.properties, **update_data})
+            if digest == stored_hash(existing.properties):
+                return product_mapper.from_object(existing)
 
-            # Convert attributes dict to JSON string if present
-            if "attributes" in update_data:
-                update_data["attributes_json"] = json.dumps(update_data.pop("attributes"))
+            changed = {
+                key: value for key, value in update_data.items()
+                if key in UNIQUE_KEYS and value != existing.properties.get(key)
+            }
+            await self._ensure_unique(product_id, changed.get("slug"), changed.get("sku"))
 
             update_data["updated_at"] = datetime.utcnow().isoformat()
+            update_data["content_hash"] = digest
 
-            self.collection.data.update(
-                uuid=product_id,
-                properties=update_data,
-            )
+            if not await update_object(self.collection, product_id, update_data):
+                raise NotFoundException(f"Product with ID {product_id} not found")
+            properties = {**existing.properties, **update_data}
+            invalidate_counts("Product")
+            await bump_catalog_version(self.client)
 
-            updated_obj = self.collection.query.fetch_object_by_id(product_id)
+            updated = product_mapper.to_model(product_id, properties)
+            suggest_index.set_product(product_id, updated.name, updated.sku, updated.is_active)
+            _remember_keys(product_id, properties)
 
-            props = {k: str(v) if hasattr(v, "hex") else v for k, v in updated_obj.properties.items()}
-            # Deserialize attributes_json to attributes
-            if "attributes_json" in props:
-                props["attributes"] = json.loads(props.pop("attributes_json"))
-            return Product(id=product_id, **props)
-        except NotFoundException:
+            return updated
+        except (NotFoundException, ConflictException):
             raise
         except Exception as e:
             logger.error(f"Error updating product: {e}")
             raise DatabaseException(f"Failed to update product: {e!s}")
 
-    def delete_product(self, product_id: str) -> bool:
+    async def delete_product(self, product_id: str) -> bool:
         """Delete product"""
         try:
-            existing = self.collection.query.fetch_object_by_id(product_id)
-            if not existing:
+            if not await self.collection.data.delete_by_id(product_id):
                 raise NotFoundException(f"Product with ID {product_id} not found")
 
-            self.collection.data.delete_by_id(product_id)
+            suggest_index.remove_product(product_id)
+            invalidate_counts("Product")
+            await bump_catalog_version(self.client)
             return True
         except NotFoundException:
             raise
@@ -163,22 +521,579 @@ class ProductService:
             logger.error(f"Error deleting product: {e}")
             raise DatabaseException(f"Failed to delete product: {e!s}")
 
-    def search_products(self, query: str, limit: int = 10) -> list[Product]:
-        """Search products using vector search"""
+    async def bulk_update_products(
+        self,
+        items: list[ProductPatchItem],
+        batch_size: int = 200,
+        concurrency: int = 4,
+    ) -> BulkOperationResult:
+        """Apply per-product patches in batches
+
+        Each batch is one ID-filtered read followed by concurrent partial updates
+        of the patched fields, instead of the three sequential round trips per
+        product of update_product. Patches for the same ID are merged; slug and
+        SKU changes go through update_product.
+        """
+        patches: dict[str, tuple[int, str, dict[str, Any]]] = {}
+        for index, item in enumerate(items, start=1):
+            changes = self._check_bulk_patch(item)
+            if item.id in patches:
+                patches[item.id][2].update(changes)
+            else:
+                patches[item.id] = (index, item.id, changes)
+
+        result = BulkOperationResult()
+        pending = list(patches.values())
+
+        async def batches():
+            for start in range(0, len(pending), batch_size):
+                yield pending[start:start + batch_size]
+
+        await self._run_batches(batches(), lambda batch: self._patch_batch(batch, result), concurrency)
+        result.errors.sort(key=lambda error: error.index)
+        return result
+
+    async def update_products_by_filter(
+        self,
+        selector: ProductSelector,
+        product_update: ProductUpdate,
+        batch_size: int = 200,
+        concurrency: int = 4,
+    ) -> BulkOperationResult:
+        """Apply one patch to every product matching selector
+
+        The IDs of the matching products are read first, so a patch that changes
+        a filtered field cannot move rows in or out of the pages still to be
+        read. Those IDs are then patched in batches like bulk_update_products.
+        """
+        changes = self._check_bulk_patch(product_update)
+        filters = self._selector_filters(selector)
+        result = BulkOperationResult()
+
         try:
-            result = self.collection.query.near_text(
+            ids = await self._matching_ids(filters)
+
+            async def batches():
+                for start in range(0, len(ids), batch_size):
+                    yield [
+                        (start + i, product_id, changes)
+                        for i, product_id in enumerate(ids[start:start + batch_size], start=1)
+                    ]
+
+            await self._run_batches(batches(), lambda batch: self._patch_batch(batch, result), concurrency)
+        except BadRequestException:
+            raise
+        except Exception as e:
+            logger.error(f"Error updating products by filter: {e}")
+            raise DatabaseException(f"Failed to update products: {e!s}")
+        result.errors.sort(key=lambda error: error.index)
+        return result
+
+    async def _matching_ids(self, filters) -> list[str]:
+        """IDs of every product matching filters, each listed once, in keyset order"""
+        ids: dict[str, None] = {}
+        cursor = None
+        while True:
+            page = await self.collection.query.fetch_objects(
+                **build_page_query(filters, 1, SNAPSHOT_PAGE_SIZE, cursor, return_properties=[])
+            )
+            ids.update((str(obj.uuid), None) for obj in page.objects)
+            cursor = build_next_cursor(page.objects, SNAPSHOT_PAGE_SIZE, filters, cursor)
+            if cursor is None:
+                return list(ids)
+
+    async def delete_products_by_filter(self, selector: ProductSelector) -> BulkOperationResult:
+        """Delete every product matching selector with server-side batch deletes"""
+        filters = self._selector_filters(selector)
+        result = BulkOperationResult()
+        # Products that failed, by ID; each later round retries them, so they
+        # are counted once, with their last error
+        failed: dict[str, str] = {}
+        try:
+            # Each delete_many call is capped by Weaviate's query limit, so repeat
+            # until nothing more matches or nothing more can be deleted
+            while True:
+                response = await self.collection.data.delete_many(where=filters, verbose=True)
+                result.succeeded += response.successful
+                deleted = []
+                for obj in response.objects or []:
+                    if obj.successful:
+                        deleted.append(obj.uuid)
+                        failed.pop(str(obj.uuid), None)
+                    else:
+                        failed[str(obj.uuid)] = obj.error or "Delete failed"
+                suggest_index.remove_products(deleted)
+                if not response.matches or not response.successful:
+                    break
+        except BadRequestException:
+            raise
+        except Exception as e:
+            logger.error(f"Error deleting products by filter: {e}")
+            raise DatabaseException(f"Failed to delete products: {e!s}")
+        finally:
+            invalidate_counts("Product")
+            await bump_catalog_version(self.client)
+        result.failed = len(failed)
+        result.matched = result.succeeded + result.failed
+        result.errors = [
+            BulkItemError(index=index, key=product_id, message=message)
+            for index, (product_id, message) in enumerate(failed.items(), start=1)
+        ]
+        return result
+
+    def _check_bulk_patch(self, product_update: ProductUpdate) -> dict[str, Any]:
+        changes = self._patch_properties(product_update)
+        if not changes:
+            raise BadRequestException("No changes given")
+        if "slug" in changes or "sku" in changes:
+            raise BadRequestException("slug and sku can only be changed one product at a time")
+        return changes
+
+    async def _run_batches(self, batches: AsyncIterable, write, concurrency: int):
+        """Run write(batch) for each batch with at most concurrency in flight"""
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks: set[asyncio.Task] = set()
+
+        async def run(batch):
+            try:
+                await write(batch)
+            finally:
+                semaphore.release()
+
+        try:
+            async for batch in batches:
+                await semaphore.acquire()
+                task = asyncio.create_task(run(batch))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except BaseException:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            invalidate_counts("Product")
+            await bump_catalog_version(self.client)
+
+    async def _patch_batch(self, batch: list[tuple[int, str, dict[str, Any]]], result: BulkOperationResult):
+        """Read one batch of patched products by ID and write them back"""
+        targets = {}
+        for index, product_id, changes in batch:
+            try:
+                targets[str(UUID(product_id))] = (index, product_id, changes)
+            except ValueError:
+                result.failed += 1
+                result.errors.append(BulkItemError(index=index, key=product_id, message="Invalid product ID"))
+
+        found = {}
+        if targets:
+            try:
+                existing = await self.collection.query.fetch_objects(
+                    filters=Filter.by_id().contains_any(list(targets)),
+                    limit=len(targets),
+                )
+                found = {str(obj.uuid): obj for obj in existing.objects}
+            except Exception as e:
+                logger.error(f"Error reading product update batch: {e}")
+                result.failed += len(targets)
+                result.errors.extend(
+                    BulkItemError(index=index, key=product_id, message=f"Batch read failed: {e!s}")
+                    for index, product_id, _ in targets.values()
+                )
+                return
+
+        patches = []
+        for key, (index, product_id, changes) in targets.items():
+            obj = found.get(key)
+            if obj is None:
+                result.failed += 1
+                result.errors.append(BulkItemError(index=index, key=product_id, message="Product not found"))
+            else:
+                patches.append((index, obj, changes))
+        await self._write_patches(patches, result)
+
+    async def _write_patches(self, patches: list[tuple[int, Any, dict[str, Any]]], result: BulkOperationResult):
+        """Write (index, stored object, changes) patches as concurrent partial updates
+
+        Only the patched fields are sent, so edits made to other fields of a
+        product since it was read are kept.
+        """
+        if not patches:
+            return
+        result.matched += len(patches)
+        now = datetime.utcnow().isoformat()
+        writes = []
+        for index, obj, changes in patches:
+            digest = content_hash({**obj.properties, **changes})
+            if digest == stored_hash(obj.properties):
+                result.unchanged += 1
+                continue
+            writes.append((index, obj, {**changes, "updated_at": now, "content_hash": digest}))
+        if not writes:
+            return
+
+        outcomes = await asyncio.gather(
+            *(update_object(self.collection, str(obj.uuid), update) for _, obj, update in writes),
+            return_exceptions=True,
+        )
+        indexed = []
+        for (index, obj, update), outcome in zip(writes, outcomes):
+            if outcome is not True:
+                if isinstance(outcome, Exception):
+                    logger.error(f"Error writing product update {obj.uuid}: {outcome}")
+                message = f"Write failed: {outcome!s}" if isinstance(outcome, Exception) else "Product not found"
+                result.failed += 1
+                result.errors.append(BulkItemError(index=index, key=str(obj.uuid), message=message))
+                continue
+            result.succeeded += 1
+            props = {**obj.properties, **update}
+            indexed.append((obj.uuid, props.get("name"), props.get("sku"), props.get("is_active", True)))
+        suggest_index.set_products(indexed)
+
+    async def search_products(
+        self,
+        query: str,
+        limit: int = 10,
+        fields: str | None = None,
+        alpha: float = 0.5,
+        category_id: str | None = None,
+        section_id: str | None = None,
+        is_active: bool | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> tuple[list[SearchHit], int, str | None]:
+        """Search products with hybrid keyword (BM25) and vector ranking
+
+        alpha weighs the two: 0 is keyword only, 1 is vector only. Query vectors
+        come from the query vector cache when possible, so Weaviate only embeds
+        the text on a cache miss. Filters are applied by Weaviate before ranking.
+        Results are cached until the next product write. When cursor is given, offset is ignored;
+        the offset actually used is returned with the hits and the next cursor.
+        """
+        try:
+            mapper = product_mapper.select(fields)
+            filters = self._build_filters(category_id, section_id, is_active, None, min_price, max_price)
+            fingerprint = query_fingerprint(
+                query, alpha, category_id, section_id, is_active, min_price, max_price,
+            )
+            if cursor is not None:
+                offset = decode_offset_cursor(cursor, fingerprint)
+
+            version = await catalog_version.get(self.client)
+            cache_key = (
+                version, normalize_query(query), alpha, category_id, section_id,
+                is_active, min_price, max_price, offset, limit, fields,
+            )
+            cached = _search_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            vector = await query_vector_cache.get(query) if alpha > 0 else None
+
+            result = await self.collection.query.hybrid(
                 query=query,
+                alpha=alpha,
+                vector=vector,
+                query_properties=SEARCH_PROPERTIES,
+                filters=filters,
                 limit=limit,
+                offset=offset,
+                return_properties=mapper.properties if fields else None,
+                return_metadata=MetadataQuery(score=True),
             )
 
-            products = []
-            for obj in result.objects:
-                props = {k: str(v) if hasattr(v, "hex") else v for k, v in obj.properties.items()}
-                # Deserialize attributes_json to attributes
-                if "attributes_json" in props:
-                    props["attributes"] = json.loads(props.pop("attributes_json"))
-                products.append(Product(id=str(obj.uuid), **props))
-            return products
+            hits = [
+                SearchHit(score=obj.metadata.score, item=mapper.from_object(obj))
+                for obj in result.objects
+            ]
+            page = hits, offset, build_offset_cursor(result.objects, offset, limit, fingerprint)
+            # Results fetched across a concurrent write may already be stale
+            if version == await catalog_version.get(self.client):
+                _search_cache.set(cache_key, page)
+            return page
+        except BadRequestException:
+            raise
         except Exception as e:
             logger.error(f"Error searching products: {e}")
             raise DatabaseException(f"Failed to search products: {e!s}")
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[ProductSuggestion]:
+        """Typeahead suggestions from the in-memory prefix index"""
+        return suggest_index.search(prefix, limit)
+
+    async def bulk_upsert_products(
+        self,
+        records: AsyncIterable[dict[str, Any] | Exception],
+        batch_size: int = 200,
+        concurrency: int = 4,
+    ) -> ProductImportResult:
+        """Upsert a stream of product records keyed by SKU using batched writes
+
+        Records are validated one by one; invalid rows are reported by their
+        1-based position and do not stop the import. Up to concurrency batches
+        of batch_size objects are written at once.
+        """
+        result = ProductImportResult()
+        semaphore = asyncio.Semaphore(concurrency)
+        tasks: set[asyncio.Task] = set()
+
+        async def flush(batch: list[tuple[int, ProductCreate]]):
+            try:
+                await self._upsert_batch(batch, result)
+            finally:
+                semaphore.release()
+
+        async def schedule(batch: list[tuple[int, ProductCreate]]):
+            await semaphore.acquire()
+            task = asyncio.create_task(flush(batch))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        try:
+            batch: list[tuple[int, ProductCreate]] = []
+            index = 0
+            async for record in records:
+                index += 1
+                result.total += 1
+                error = None
+                if isinstance(record, Exception):
+                    error = f"Unreadable row: {record!s}"
+                else:
+                    try:
+                        product = ProductCreate(**record)
+                        if not product.sku:
+                            error = "sku is required for bulk import"
+                    except ValidationError as e:
+                        error = str(e)
+
+                if error:
+                    sku = record.get("sku") if isinstance(record, dict) else None
+                    key = str(sku) if sku is not None else None
+                    result.failed += 1
+                    result.errors.append(BulkItemError(index=index, key=key, message=error))
+                    continue
+
+                batch.append((index, product))
+                if len(batch) >= batch_size:
+                    await schedule(batch)
+                    batch = []
+
+            if batch:
+                await schedule(batch)
+            await asyncio.gather(*tasks)
+        except ValueError as e:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise BadRequestException(f"Invalid import feed: {e!s}")
+        finally:
+            invalidate_counts("Product")
+            await bump_catalog_version(self.client)
+
+        result.errors.sort(key=lambda error: error.index)
+        return result
+
+    async def _upsert_batch(self, batch: list[tuple[int, ProductCreate]], result: ProductImportResult):
+        """Write one batch, reusing the UUID and created_at of existing SKUs
+
+        Records whose content hash matches the stored one are left alone. When
+        a SKU repeats within the batch the last row wins and the earlier ones
+        are reported as errors.
+        """
+        last = {product.sku: index for index, product in batch}
+        for index, product in batch:
+            if last[product.sku] != index:
+                result.failed += 1
+                result.errors.append(BulkItemError(
+                    index=index, key=product.sku, message=f"Duplicate sku; replaced by row {last[product.sku]}"
+                ))
+        batch = [(index, product) for index, product in batch if last[product.sku] == index]
+
+        skus = [product.sku for _, product in batch]
+        try:
+            known = await self._find_by_skus(skus, ["sku", "slug", "created_at", "content_hash"])
+
+            now = datetime.utcnow().isoformat()
+            created_at = batch_timestamps(len(batch))
+            unslugged = []
+            written = []
+            objects = []
+            for position, (index, product) in enumerate(batch):
+                props = self._to_properties(product, now)
+                match = known.get(product.sku)
+                if not product.slug:
+                    # Keep the slug a product already has; new ones get a free one below
+                    stored = match.properties.get("slug") if match else None
+                    if stored:
+                        props["slug"] = stored
+                    else:
+                        unslugged.append(props)
+                props["content_hash"] = content_hash(props)
+                if match and match.properties.get("content_hash") == props["content_hash"]:
+                    result.unchanged += 1
+                    continue
+                if match:
+                    props["created_at"] = match.properties.get("created_at") or now
+                else:
+                    props["created_at"] = created_at[position]
+                props["created_ts"] = keyset_timestamp(props["created_at"])
+                uuid = match.uuid if match else generate_uuid5(product.sku)
+                written.append((index, product))
+                objects.append(DataObject(properties=props, uuid=uuid))
+            if not objects:
+                return
+
+            if unslugged:
+                slugs = await self._free_slugs([props["slug"] for props in unslugged])
+                for props, slug in zip(unslugged, slugs):
+                    props["slug"] = slug
+                    props["content_hash"] = content_hash(props)
+
+            response = await self.collection.data.insert_many(objects)
+        except Exception as e:
+            logger.error(f"Error writing product import batch: {e}")
+            result.failed += len(batch)
+            result.errors.extend(
+                BulkItemError(index=index, key=product.sku, message=f"Batch write failed: {e!s}")
+                for index, product in batch
+            )
+            return
+
+        indexed = []
+        for position, (index, product) in enumerate(written):
+            error = response.errors.get(position)
+            if error:
+                result.failed += 1
+                result.errors.append(BulkItemError(index=index, key=product.sku, message=error.message))
+                continue
+
+            indexed.append((objects[position].uuid, product.name, product.sku, product.is_active))
+            _remember_keys(objects[position].uuid, objects[position].properties)
+            if product.sku in known:
+                result.updated += 1
+            else:
+                result.created += 1
+        suggest_index.set_products(indexed)
+
+    async def sync_products_by_sku(
+        self,
+        changes: list[tuple[int, str, dict[str, Any] | None]],
+        result: ProductSyncResult,
+        batch_size: int = 200,
+        concurrency: int = 4,
+    ):
+        """Apply (index, sku, record) changes from a supplier feed in batches
+
+        A record patches the product with that SKU, or creates it if there is
+        none; a record of None deactivates the product. Each batch is one
+        ID-filtered read, a lookup of the SKUs not found by ID, one slug query
+        for new products and one batch write.
+        """
+
+        async def batches():
+            for start in range(0, len(changes), batch_size):
+                yield changes[start:start + batch_size]
+
+        await self._run_batches(batches(), lambda batch: self._sync_batch(batch, result), concurrency)
+
+    async def _sync_batch(self, batch: list[tuple[int, str, dict[str, Any] | None]], result: ProductSyncResult):
+        """Read one batch of synced products by SKU and write the changed ones"""
+        skus = [sku for _, sku, _ in batch]
+        try:
+            known = await self._find_by_skus(skus)
+        except Exception as e:
+            logger.error(f"Error reading product sync batch: {e}")
+            result.failed += len(batch)
+            result.errors.extend(
+                BulkItemError(index=index, key=sku, message=f"Batch read failed: {e!s}")
+                for index, sku, _ in batch
+            )
+            return
+
+        now = datetime.utcnow().isoformat()
+        created_at = batch_timestamps(len(batch))
+        unslugged = []
+        written = []
+        objects = []
+        for position, (index, sku, record) in enumerate(batch):
+            obj = known.get(sku)
+            try:
+                if record is None:
+                    if obj is None:
+                        result.unchanged += 1
+                        continue
+                    kind, changes = "deactivated", {"is_active": False}
+                elif obj is None:
+                    kind = "created"
+                    product = ProductCreate(**{**record, "sku": sku})
+                    props = self._to_properties(product, now)
+                    if not product.slug:
+                        unslugged.append(props)
+                    props["created_at"] = created_at[position]
+                    props["created_ts"] = keyset_timestamp(props["created_at"])
+                    props["content_hash"] = content_hash(props)
+                    written.append((index, sku, kind))
+                    objects.append(DataObject(properties=props, uuid=generate_uuid5(sku)))
+                    continue
+                else:
+                    kind, changes = "updated", self._patch_properties(ProductUpdate(**record))
+                    changes.pop("sku", None)
+                    if changes.get("slug", obj.properties.get("slug")) != obj.properties.get("slug"):
+                        raise ValueError("slug can only be changed one product at a time")
+            except Exception as e:
+                result.failed += 1
+                result.errors.append(BulkItemError(index=index, key=sku, message=str(e)))
+                continue
+
+            properties = {**obj.properties, **changes}
+            digest = content_hash(properties)
+            if digest == stored_hash(obj.properties):
+                result.unchanged += 1
+                continue
+            properties.update(updated_at=now, content_hash=digest)
+            written.append((index, sku, kind))
+            objects.append(DataObject(properties=properties, uuid=obj.uuid))
+        if not objects:
+            return
+
+        try:
+            if unslugged:
+                slugs = await self._free_slugs([props["slug"] for props in unslugged])
+                for props, slug in zip(unslugged, slugs):
+                    props["slug"] = slug
+                    props["content_hash"] = content_hash(props)
+            response = await self.collection.data.insert_many(objects)
+        except Exception as e:
+            logger.error(f"Error writing product sync batch: {e}")
+            result.failed += len(written)
+            result.errors.extend(
+                BulkItemError(index=index, key=sku, message=f"Batch write failed: {e!s}")
+                for index, sku, _ in written
+            )
+            return
+
+        indexed = []
+        for position, (index, sku, kind) in enumerate(written):
+            error = response.errors.get(position)
+            if error:
+                result.failed += 1
+                result.errors.append(BulkItemError(index=index, key=sku, message=error.message))
+                continue
+            if kind == "created":
+                result.created += 1
+            elif kind == "updated":
+                result.updated += 1
+            else:
+                result.deactivated += 1
+            props = objects[position].properties
+            indexed.append((objects[position].uuid, props.get("name"), sku, props.get("is_active", True)))
+            _remember_keys(objects[position].uuid, props)
+        suggest_index.set_products(indexed)
+
+    async def export_products(self, page_size: int = 1000) -> AsyncIterator[dict[str, Any]]:
+        """Stream every product using Weaviate's cursor iterator"""
+        try:
+            async for obj in self.collection.iterator(cache_size=page_size):
+                yield product_mapper.to_dict(obj.uuid, obj.properties)
+        except Exception as e:
+            logger.error(f"Error exporting products: {e}")
+            raise
@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import httpx
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Embedding a query must stay cheaper than letting Weaviate do it
+INFERENCE_TIMEOUT = 2.0
+# Seconds to leave embedding to Weaviate after the inference container fails
+INFERENCE_RETRY_DELAY = 30.0
+
+
+def normalize_query(text: str) -> str:
+    """Normalize query text so trivially different spellings share a vector"""
+    return " ".join(text.split()).casefold()
+
+
+class QueryVectorCache:
+    """LRU cache of search query embeddings
+
+    Misses are embedded by calling the same transformers inference container
+    Weaviate uses, so cached vectors match what Weaviate would compute. Without
+    an inference URL, or when the call fails, lookups return None and search
+    lets Weaviate embed the query itself.
+    """
+
+    def __init__(self, inference_url: str, maxsize: int):
+        self.inference_url = inference_url.rstrip("/")
+        self._vectors = TTLCache(maxsize=maxsize)
+        self._pending: dict[str, asyncio.Future] = {}
+        self._http: httpx.AsyncClient | None = None
+        self._retry_at = 0.0
+
+    async def get(self, text: str) -> list[float] | None:
+        """Get the vector for a query, embedding and caching it on a miss"""
+        key = normalize_query(text)
+        vector = self._vectors.get(key)
+        if vector is not None or not self.inference_url or not key:
+            return vector
+        if time.monotonic() < self._retry_at:
+            return None
+
+        # Concurrent misses for the same query share one inference call
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            vector = await self._embed(key)
+            if vector is not None:
+                self._vectors.set(key, vector)
+            future.set_result(vector)
+            return vector
+        finally:
+            if not future.done():
+                future.set_result(None)
+            del self._pending[key]
+
+    async def _embed(self, text: str) -> list[float] | None:
+        """Ask the inference container for the embedding of a text"""
+        if self._http is None:
+            self._http = httpx.AsyncClient(base_url=self.inference_url, timeout=INFERENCE_TIMEOUT)
+        try:
+            response = await self._http.post("/vectors", json={"text": text})
+            response.raise_for_status()
+            return response.json()["vector"]
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            logger.warning(f"Query embedding failed, falling back to Weaviate: {e}")
+            self._retry_at = time.monotonic() + INFERENCE_RETRY_DELAY
+            return None
+
+    def clear(self) -> None:
+        """Drop all cached vectors, e.g. after the vectorizer model changes"""
+        self._vectors.clear()
+
+    async def close(self) -> None:
+        """Close the inference HTTP client"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+# Global query vector cache
+query_vector_cache = QueryVectorCache(
+    settings.TRANSFORMERS_INFERENCE_URL,
+    maxsize=settings.QUERY_VECTOR_CACHE_SIZE,
+)
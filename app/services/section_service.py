@@ -1,8 +1,15 @@
+import asyncio
 from datetime import datetime
 
+from weaviate.classes.query import Filter
+
 from app.core.exceptions import DatabaseException, NotFoundException
 from app.core.logging import get_logger
+from app.db.aggregates import count_objects, invalidate_counts
+from app.db.mappers import section_mapper
+from app.db.writes import patch_object
 from app.models.section import Section, SectionCreate, SectionUpdate
+from app.services.catalog_service import invalidate_catalog_tree
 
 logger = get_logger(__name__)
 
@@ -14,7 +21,7 @@ class SectionService:
         self.client = client
         self.collection = client.collections.get("Section")
 
-    def create_section(self, section: SectionCreate) -> Section:
+    async def create_section(self, section: SectionCreate) -> Section:
         """Create a new section"""
         try:
             now = datetime.utcnow().isoformat()
@@ -22,97 +29,87 @@ class SectionService:
             section_dict["created_at"] = now
             section_dict["updated_at"] = now
 
-            uuid = self.collection.data.insert(section_dict)
+            uuid = await self.collection.data.insert(section_dict)
+            invalidate_counts("Section")
+            invalidate_catalog_tree()
 
-            return Section(id=str(uuid), **section_dict)
+            return section_mapper.to_model(uuid, section_dict)
         except Exception as e:
             logger.error(f"Error creating section: {e}")
             raise DatabaseException(f"Failed to create section: {e!s}")
 
-    def get_section(self, section_id: str) -> Section:
+    async def get_section(self, section_id: str) -> Section:
         """Get section by ID"""
         try:
-            obj = self.collection.query.fetch_object_by_id(section_id)
+            obj = await self.collection.query.fetch_object_by_id(section_id)
 
             if not obj:
                 raise NotFoundException(f"Section with ID {section_id} not found")
 
-            return Section(id=str(obj.uuid), **obj.properties)
+            return section_mapper.from_object(obj)
         except NotFoundException:
             raise
         except Exception as e:
             logger.error(f"Error fetching section: {e}")
             raise DatabaseException(f"Failed to fetch section: {e!s}")
 
-    def list_sections(self, page: int = 1, page_size: int = 20, parent_id: str | None = None) -> tuple:
+    async def list_sections(self, page: int = 1, page_size: int = 20, parent_id: str | None = None) -> tuple:
         """List all sections with pagination"""
         try:
+            filters = None
             if parent_id:
                 # Filter by parent section
-                result = self.collection.query.fetch_objects(
-                    limit=page_size,
-                    offset=(page - 1) * page_size,
-                    filters={"parent_section_id": parent_id},
-                )
-            else:
-                result = self.collection.query.fetch_objects(
+                filters = Filter.by_property("parent_section_id").equal(parent_id)
+
+            result, total = await asyncio.gather(
+                self.collection.query.fetch_objects(
                     limit=page_size,
                     offset=(page - 1) * page_size,
-                )
-
-            sections = [Section(id=str(obj.uuid), **obj.properties) for obj in result.objects]
+                    filters=filters,
+                ),
+                count_objects(self.collection, filters, cache_key=(parent_id or None,)),
+            )
 
-            # Get total count (approximate)
-            total = len(result.objects) + (page - 1) * page_size
-            if len(result.objects) == page_size:
-                total = page * page_size + 1  # Estimate more exist
+            sections = [section_mapper.from_object(obj) for obj in result.objects]
 
             return sections, total
         except Exception as e:
             logger.error(f"Error listing sections: {e}")
             raise DatabaseException(f"Failed to list sections: {e!s}")
 
-    def update_section(self, section_id: str, section_update: SectionUpdate) -> Section:
+    async def update_section(self, section_id: str, section_update: SectionUpdate) -> Section:
         """Update section"""
         try:
-            # Check if exists
-            existing = self.collection.query.fetch_object_by_id(section_id)
-            if not existing:
-                raise NotFoundException(f"Section with ID {section_id} not found")
-
             # Prepare update data
             update_data = {k: v for k, v in section_update.model_dump().items() if v is not None}
 
             if not update_data:
-                return Section(id=section_id, **existing.properties)
+                return await self.get_section(section_id)
 
             update_data["updated_at"] = datetime.utcnow().isoformat()
 
-            # Update
-            self.collection.data.update(
-                uuid=section_id,
-                properties=update_data,
-            )
-
-            # Fetch updated
-            updated_obj = self.collection.query.fetch_object_by_id(section_id)
+            # Update; the response is the stored row with the patch merged in
+            properties = await patch_object(self.collection, section_id, update_data)
+            if properties is None:
+                raise NotFoundException(f"Section with ID {section_id} not found")
+            invalidate_counts("Section")
+            invalidate_catalog_tree()
 
-            return Section(id=section_id, **updated_obj.properties)
+            return section_mapper.to_model(section_id, properties)
         except NotFoundException:
             raise
         except Exception as e:
             logger.error(f"Error updating section: {e}")
             raise DatabaseException(f"Failed to update section: {e!s}")
 
-    def delete_section(self, section_id: str) -> bool:
+    async def delete_section(self, section_id: str) -> bool:
         """Delete section"""
         try:
-            # Check if exists
-            existing = self.collection.query.fetch_object_by_id(section_id)
-            if not existing:
+            if not await self.collection.data.delete_by_id(section_id):
                 raise NotFoundException(f"Section with ID {section_id} not found")
 
-            self.collection.data.delete_by_id(section_id)
+            invalidate_counts("Section")
+            invalidate_catalog_tree()
             return True
         except NotFoundException:
             raise
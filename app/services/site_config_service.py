@@ -1,10 +1,18 @@
 from datetime import datetime
 
+from app.core.cache import TTLCache
+from app.core.config import get_settings
 from app.core.exceptions import DatabaseException, NotFoundException
 from app.core.logging import get_logger
+from app.db.mappers import site_config_mapper
 from app.models.site_config import SiteConfig, SiteConfigCreate, SiteConfigUpdate
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+# Single-entry cache; the TTL bounds staleness from writes made by other workers
+_config_cache = TTLCache(maxsize=1, ttl=settings.SITE_CONFIG_CACHE_TTL)
+_CONFIG_KEY = "site_config"
 
 
 class SiteConfigService:
@@ -14,30 +22,33 @@ class SiteConfigService:
         self.client = client
         self.collection = client.collections.get("SiteConfig")
 
-    def get_config(self) -> SiteConfig:
+    async def get_config(self) -> SiteConfig:
         """Get site configuration (only one should exist)"""
+        cached = _config_cache.get(_CONFIG_KEY)
+        if cached is not None:
+            return cached
+
         try:
-            result = self.collection.query.fetch_objects(limit=1)
+            result = await self.collection.query.fetch_objects(limit=1)
 
             if len(result.objects) == 0:
                 raise NotFoundException("Site configuration not found")
 
             obj = result.objects[0]
-            return SiteConfig(
-                id=str(obj.uuid),
-                **obj.properties,
-            )
+            config = site_config_mapper.from_object(obj)
+            _config_cache.set(_CONFIG_KEY, config)
+            return config
         except NotFoundException:
             raise
         except Exception as e:
             logger.error(f"Error fetching site config: {e}")
             raise DatabaseException(f"Failed to fetch site configuration: {e!s}")
 
-    def create_config(self, config: SiteConfigCreate) -> SiteConfig:
+    async def create_config(self, config: SiteConfigCreate) -> SiteConfig:
         """Create site configuration"""
         try:
             # Check if config already exists
-            existing = self.collection.query.fetch_objects(limit=1)
+            existing = await self.collection.query.fetch_objects(limit=1)
             if len(existing.objects) > 0:
                 raise DatabaseException("Site configuration already exists. Use update instead.")
 
@@ -46,18 +57,20 @@ class SiteConfigService:
             config_dict["created_at"] = now
             config_dict["updated_at"] = now
 
-            uuid = self.collection.data.insert(config_dict)
+            uuid = await self.collection.data.insert(config_dict)
 
-            return SiteConfig(id=str(uuid), **config_dict)
+            config = site_config_mapper.to_model(uuid, config_dict)
+            _config_cache.set(_CONFIG_KEY, config)
+            return config
         except Exception as e:
             logger.error(f"Error creating site config: {e}")
             raise DatabaseException(f"Failed to create site configuration: {e!s}")
 
-    def update_config(self, config_update: SiteConfigUpdate) -> SiteConfig:
+    async def update_config(self, config_update: SiteConfigUpdate) -> SiteConfig:
         """Update site configuration"""
         try:
             # Get existing config
-            result = self.collection.query.fetch_objects(limit=1)
+            result = await self.collection.query.fetch_objects(limit=1)
 
             if len(result.objects) == 0:
                 raise NotFoundException("Site configuration not found")
@@ -69,23 +82,23 @@ class SiteConfigService:
             update_data = {k: v for k, v in config_update.model_dump().items() if v is not None}
 
             if not update_data:
-                return SiteConfig(id=config_id, **obj.properties)
+                return site_config_mapper.from_object(obj)
 
             update_data["updated_at"] = datetime.utcnow().isoformat()
 
             # Update in Weaviate
-            self.collection.data.update(
+            _config_cache.invalidate(_CONFIG_KEY)
+            await self.collection.data.update(
                 uuid=config_id,
                 properties=update_data,
             )
 
             # Fetch updated config
-            updated_obj = self.collection.query.fetch_object_by_id(config_id)
+            updated_obj = await self.collection.query.fetch_object_by_id(config_id)
 
-            return SiteConfig(
-                id=config_id,
-                **updated_obj.properties,
-            )
+            config = site_config_mapper.from_object(updated_obj)
+            _config_cache.set(_CONFIG_KEY, config)
+            return config
         except NotFoundException:
             raise
         except Exception as e:
@@ -0,0 +1,235 @@
+import heapq
+from bisect import bisect_left, insort
+from collections.abc import Iterable, Iterator
+
+from app.core.logging import get_logger
+from app.models.product import ProductSuggestion
+from app.services.query_vectors import normalize_query
+
+logger = get_logger(__name__)
+
+# Word positions of a name that start an indexed term ("pro" finds "iPhone 15 Pro")
+MAX_NAME_WORDS = 8
+
+# Terms per block of the sorted term list; a block is split at twice this size
+BLOCK_SIZE = 512
+
+Term = tuple[str, str, str]
+
+
+def _name_terms(name: str) -> list[str]:
+    words = normalize_query(name).split()[:MAX_NAME_WORDS]
+    return sorted({" ".join(words[i:]) for i in range(len(words))})
+
+
+class _SortedTerms:
+    """Sorted (term, kind, id) tuples kept in blocks of at most 2 * BLOCK_SIZE
+
+    The block holding a term is found by binary search over the block maxima,
+    and an insert or delete only shifts that one block, so single writes stay
+    cheap however large the index grows.
+    """
+
+    def __init__(self, terms: Iterable[Term] = ()):
+        terms = sorted(terms)
+        self._blocks = [terms[i:i + BLOCK_SIZE] for i in range(0, len(terms), BLOCK_SIZE)]
+        self._maxes = [block[-1] for block in self._blocks]
+        self._len = len(terms)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Term]:
+        for block in self._blocks:
+            yield from block
+
+    def add(self, term: Term):
+        if not self._blocks:
+            self._blocks, self._maxes = [[term]], [term]
+            self._len = 1
+            return
+        i = min(bisect_left(self._maxes, term), len(self._blocks) - 1)
+        block = self._blocks[i]
+        insort(block, term)
+        self._maxes[i] = block[-1]
+        if len(block) > 2 * BLOCK_SIZE:
+            self._blocks[i:i + 1] = [block[:BLOCK_SIZE], block[BLOCK_SIZE:]]
+            self._maxes[i:i + 1] = [block[BLOCK_SIZE - 1], block[-1]]
+        self._len += 1
+
+    def discard(self, term: Term):
+        i = bisect_left(self._maxes, term)
+        if i == len(self._blocks):
+            return
+        block = self._blocks[i]
+        j = bisect_left(block, term)
+        if j == len(block) or block[j] != term:
+            return
+        del block[j]
+        if block:
+            self._maxes[i] = block[-1]
+        else:
+            del self._blocks[i], self._maxes[i]
+        self._len -= 1
+
+    def iter_from(self, term: Term) -> Iterator[Term]:
+        """Terms from the first one not less than term, in order"""
+        i = bisect_left(self._maxes, term)
+        if i == len(self._blocks):
+            return
+        block = self._blocks[i]
+        for j in range(bisect_left(block, term), len(block)):
+            yield block[j]
+        for block in self._blocks[i + 1:]:
+            yield from block
+
+
+class SuggestIndex:
+    """In-memory prefix index over product names, SKUs and category names
+
+    Terms are kept sorted, so a lookup is a binary search followed by a short
+    scan. ProductService and CategoryService keep it current on write, bulk
+    writes once per batch; a periodic rebuild from Weaviate picks up writes
+    made by other workers.
+    """
+
+    def __init__(self):
+        self._terms = _SortedTerms()
+        # (kind, id) -> (display text, indexed terms)
+        self._entries: dict[tuple[str, str], tuple[str, list[str]]] = {}
+        # Writes seen while a rebuild is reading Weaviate, replayed onto its result
+        self._rebuild_writes: dict[tuple[str, str], str | None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def search(self, prefix: str, limit: int = 10) -> list[ProductSuggestion]:
+        """Suggestions whose name, SKU or category name starts with prefix"""
+        prefix = normalize_query(prefix)
+        if not prefix:
+            return []
+
+        suggestions = []
+        seen = set()
+        for term, kind, ref_id in self._terms.iter_from((prefix,)):
+            if len(suggestions) >= limit or not term.startswith(prefix):
+                break
+            if (kind, ref_id) not in seen:
+                seen.add((kind, ref_id))
+                text = self._entries[(kind, ref_id)][0]
+                suggestions.append(ProductSuggestion(text=text, kind=kind, id=ref_id))
+        return suggestions
+
+    def set_product(self, product_id: str, name: str | None, sku: str | None, is_active: bool = True):
+        """Index or re-index a product; inactive products are removed"""
+        self.set_products([(product_id, name, sku, is_active)])
+
+    def set_products(self, products: Iterable[tuple[str, str | None, str | None, bool]]):
+        """Index or re-index the (id, name, sku, is_active) products of one bulk write"""
+        changes = []
+        for product_id, name, sku, is_active in products:
+            product_id = str(product_id)
+            changes.append(("name", product_id, name if is_active else None))
+            changes.append(("sku", product_id, sku if is_active else None))
+        self._set(changes)
+
+    def remove_product(self, product_id: str):
+        """Remove a deleted product"""
+        self.set_products([(product_id, None, None, False)])
+
+    def remove_products(self, product_ids: Iterable[str]):
+        """Remove the products of one bulk delete"""
+        self.set_products((product_id, None, None, False) for product_id in product_ids)
+
+    def set_category(self, category_id: str, name: str | None, is_active: bool = True):
+        """Index or re-index a category; inactive categories are removed"""
+        self._set([("category", str(category_id), name if is_active else None)])
+
+    def remove_category(self, category_id: str):
+        """Remove a deleted category"""
+        self.set_category(category_id, None)
+
+    def _set(self, changes: list[tuple[str, str, str | None]]):
+        """Apply (kind, id, text) changes, text None removing the entry"""
+        added: set[Term] = set()
+        removed: set[Term] = set()
+        for kind, ref_id, text in changes:
+            key = (kind, ref_id)
+            if self._rebuild_writes is not None:
+                self._rebuild_writes[key] = text
+            previous = self._entries.pop(key, None)
+            for term in previous[1] if previous else ():
+                item = (term, kind, ref_id)
+                if item in added:
+                    added.discard(item)
+                else:
+                    removed.add(item)
+            terms = self._terms_for(kind, text)
+            if terms:
+                self._entries[key] = (text, terms)
+            for term in terms:
+                item = (term, kind, ref_id)
+                if item in removed:
+                    removed.discard(item)
+                else:
+                    added.add(item)
+
+        if len(added) + len(removed) > len(self._terms) // BLOCK_SIZE:
+            # Cheaper to merge the whole batch into a new list than to touch a
+            # block per term
+            kept = (item for item in self._terms if item not in removed)
+            self._terms = _SortedTerms(heapq.merge(kept, sorted(added)))
+            return
+        for item in removed:
+            self._terms.discard(item)
+        for item in added:
+            self._terms.add(item)
+
+    @staticmethod
+    def _terms_for(kind: str, text: str | None) -> list[str]:
+        if not text:
+            return []
+        if kind == "sku":
+            return [normalize_query(text)]
+        return _name_terms(text)
+
+    async def rebuild(self, client):
+        """Rebuild the whole index from Weaviate and swap it in"""
+        entries: dict[tuple[str, str], tuple[str, list[str]]] = {}
+
+        def add(kind: str, ref_id: str, text: str | None):
+            terms = self._terms_for(kind, text)
+            if terms:
+                entries[(kind, ref_id)] = (text, terms)
+            else:
+                entries.pop((kind, ref_id), None)
+
+        self._rebuild_writes = {}
+        try:
+            products = client.collections.get("Product")
+            async for obj in products.iterator(return_properties=["name", "sku", "is_active"]):
+                if obj.properties.get("is_active", True):
+                    add("name", str(obj.uuid), obj.properties.get("name"))
+                    add("sku", str(obj.uuid), obj.properties.get("sku"))
+
+            categories = client.collections.get("Category")
+            async for obj in categories.iterator(return_properties=["name", "is_active"]):
+                if obj.properties.get("is_active", True):
+                    add("category", str(obj.uuid), obj.properties.get("name"))
+
+            for (kind, ref_id), text in self._rebuild_writes.items():
+                add(kind, ref_id, text)
+        finally:
+            self._rebuild_writes = None
+
+        terms = _SortedTerms(
+            (term, kind, ref_id)
+            for (kind, ref_id), (_, entry_terms) in entries.items()
+            for term in entry_terms
+        )
+        self._terms, self._entries = terms, entries
+        logger.info(f"Suggest index rebuilt with {len(entries)} entries")
+
+
+# Global suggest index
+suggest_index = SuggestIndex()
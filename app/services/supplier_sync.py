@@ -0,0 +1,296 @@
+import hashlib
+import heapq
+import json
+import os
+import tempfile
+from collections.abc import AsyncIterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.writes import content_hash
+from app.models.common import BulkItemError
+from app.models.product import ProductSyncResult
+from app.services.product_service import ProductService
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Snapshot entries are [sku, feed row index, row hash, record]; the committed
+# snapshot keeps {} for rows present in the feed and None for tombstones
+Entry = list[Any]
+
+
+def _read_entries(path: Path) -> Iterator[Entry]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _write_entry(f, entry: Entry) -> str:
+    line = json.dumps(entry, separators=(",", ":")) + "\n"
+    f.write(line)
+    return line
+
+
+def _replace(path: Path, write) -> None:
+    """Write a file through a temporary sibling so readers never see it half-written"""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+class SupplierFeedSync:
+    """Delta sync of the catalog from full supplier feed files
+
+    Each feed is turned into a snapshot sorted by SKU with a hash per row, using
+    sorted runs of sort_run_size rows merged from disk, so memory stays bounded
+    by the run size whatever the feed size. The snapshot is merge-joined with
+    the previous run's snapshot and only rows that were added, changed or
+    dropped are written: added and changed rows patch (or create) the product
+    with that SKU, dropped SKUs are deactivated.
+
+    Changes are applied in SKU order, a window of batch_size * concurrency at a
+    time, and a checkpoint with the last applied SKU is written after every
+    window. A run over the same feed after a crash resumes after that SKU. The
+    snapshot only replaces the previous one once the whole diff is applied;
+    rows that failed are marked so the next run retries them.
+
+    A feed that drops more than max_deactivate_ratio of the SKUs the previous
+    feed had is refused, since that is far more likely a truncated file than a
+    real assortment change; run with allow_mass_deactivation to apply it anyway.
+    """
+
+    def __init__(
+        self,
+        service: ProductService,
+        state_dir: str | Path | None = None,
+        batch_size: int | None = None,
+        concurrency: int | None = None,
+        sort_run_size: int | None = None,
+        max_deactivate_ratio: float | None = None,
+    ):
+        self.service = service
+        self.state_dir = Path(state_dir or settings.SUPPLIER_SYNC_STATE_DIR)
+        self.batch_size = batch_size or settings.BULK_BATCH_SIZE
+        self.concurrency = concurrency or settings.BULK_CONCURRENCY
+        self.sort_run_size = sort_run_size or settings.SUPPLIER_SYNC_SORT_RUN_SIZE
+        if max_deactivate_ratio is None:
+            max_deactivate_ratio = settings.SUPPLIER_SYNC_MAX_DEACTIVATE_RATIO
+        self.max_deactivate_ratio = max_deactivate_ratio
+        self.snapshot_path = self.state_dir / "snapshot.ndjson"
+        self.next_path = self.state_dir / "snapshot.next.ndjson"
+        self.checkpoint_path = self.state_dir / "checkpoint.json"
+
+    async def run(
+        self,
+        records: AsyncIterable[dict[str, Any] | Exception],
+        allow_mass_deactivation: bool = False,
+    ) -> ProductSyncResult:
+        """Sync the catalog with one full feed"""
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        result = ProductSyncResult()
+        digest = await self._build_snapshot(records, result)
+        if result.total == result.failed and self.snapshot_path.exists():
+            # An empty or unreadable drop would otherwise deactivate the whole catalog
+            self.next_path.unlink()
+            raise ValueError("Feed has no usable rows; refusing to sync")
+
+        position = None
+        failed: dict[str, bool] = {}
+        checkpoint = self._load_checkpoint()
+        if checkpoint and checkpoint["snapshot"] == digest:
+            position = checkpoint["position"]
+            failed = checkpoint["failed"]
+            result = ProductSyncResult.model_validate(checkpoint["result"])
+            result.resumed = True
+            logger.info(f"Resuming supplier sync after SKU {position!r}")
+        elif not allow_mass_deactivation:
+            # A resumed run already passed this check when it started
+            previous, dropped = self._count_drops()
+            if previous and dropped / previous > self.max_deactivate_ratio:
+                self.next_path.unlink()
+                raise ValueError(
+                    f"Feed drops {dropped} of {previous} SKUs, more than the allowed "
+                    f"{self.max_deactivate_ratio:.0%}; refusing to sync without an explicit override"
+                )
+
+        # Products dropped by an earlier sync are reactivated when they come back;
+        # on the first sync every row is new, so is_active is left as it is
+        reactivate = self.snapshot_path.exists()
+
+        window: list[tuple[int, str, dict[str, Any] | None]] = []
+        for change in self._diff(position, reactivate, result):
+            window.append(change)
+            if len(window) >= self.batch_size * self.concurrency:
+                await self._apply(window, digest, result, failed)
+                window = []
+        if window:
+            await self._apply(window, digest, result, failed)
+
+        self._commit(failed)
+        result.errors.sort(key=lambda error: error.index)
+        return result
+
+    async def _build_snapshot(self, records: AsyncIterable[dict[str, Any] | Exception], result: ProductSyncResult) -> str:
+        """Write the feed as a SKU-sorted snapshot and return its digest
+
+        When a SKU appears more than once the last row wins.
+        """
+        runs: list[Path] = []
+        entries: list[Entry] = []
+
+        def flush():
+            entries.sort(key=lambda entry: (entry[0], entry[1]))
+            fd, name = tempfile.mkstemp(dir=self.state_dir, prefix="run-", suffix=".ndjson")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    _write_entry(f, entry)
+            runs.append(Path(name))
+            entries.clear()
+
+        try:
+            index = 0
+            async for record in records:
+                index += 1
+                result.total += 1
+                if isinstance(record, Exception):
+                    error = f"Unreadable row: {record!s}"
+                elif record.get("sku") in (None, ""):
+                    error = "sku is required for supplier sync"
+                else:
+                    entries.append([str(record["sku"]), index, content_hash(record), record])
+                    if len(entries) >= self.sort_run_size:
+                        flush()
+                    continue
+                result.failed += 1
+                result.errors.append(BulkItemError(index=index, message=error))
+            if entries:
+                flush()
+
+            digest = hashlib.blake2b(digest_size=16)
+
+            def write(f):
+                merged = heapq.merge(*(_read_entries(run) for run in runs), key=lambda entry: (entry[0], entry[1]))
+                previous = None
+                for entry in merged:
+                    if previous is not None and previous[0] != entry[0]:
+                        digest.update(_write_entry(f, previous).encode())
+                    previous = entry
+                if previous is not None:
+                    digest.update(_write_entry(f, previous).encode())
+
+            _replace(self.next_path, write)
+            return digest.hexdigest()
+        finally:
+            for run in runs:
+                run.unlink(missing_ok=True)
+
+    def _count_drops(self) -> tuple[int, int]:
+        """Live SKUs of the previous snapshot, and how many of them the next one lacks"""
+        if not self.snapshot_path.exists():
+            return 0, 0
+        previous = dropped = 0
+        entries = _read_entries(self.next_path)
+        new = next(entries, None)
+        for sku, _, _, record in _read_entries(self.snapshot_path):
+            if record is None:
+                # A tombstone: its deactivation was already applied once
+                continue
+            previous += 1
+            while new is not None and new[0] < sku:
+                new = next(entries, None)
+            if new is None or new[0] != sku:
+                dropped += 1
+        return previous, dropped
+
+    def _diff(
+        self,
+        position: str | None,
+        reactivate: bool,
+        result: ProductSyncResult,
+    ) -> Iterator[tuple[int, str, dict[str, Any] | None]]:
+        """Merge-join the previous and next snapshots into (index, sku, record) changes"""
+        previous = _read_entries(self.snapshot_path) if self.snapshot_path.exists() else iter(())
+        old = next(previous, None)
+        for new in _read_entries(self.next_path):
+            sku, index, row_hash, record = new
+            while old is not None and old[0] < sku:
+                if position is None or old[0] > position:
+                    yield 0, old[0], None
+                old = next(previous, None)
+
+            if old is not None and old[0] == sku:
+                added = old[3] is None
+                unchanged = old[2] == row_hash and not added
+                old = next(previous, None)
+            else:
+                added, unchanged = True, False
+
+            if position is not None and sku <= position:
+                continue
+            if unchanged:
+                result.unchanged += 1
+                continue
+            if added and reactivate:
+                record = {"is_active": True, **record}
+            yield index, sku, record
+
+        while old is not None:
+            if position is None or old[0] > position:
+                yield 0, old[0], None
+            old = next(previous, None)
+
+    async def _apply(
+        self,
+        window: list[tuple[int, str, dict[str, Any] | None]],
+        digest: str,
+        result: ProductSyncResult,
+        failed: dict[str, bool],
+    ):
+        """Apply one window of changes and checkpoint after its last SKU"""
+        errors_before = len(result.errors)
+        await self.service.sync_products_by_sku(window, result, self.batch_size, self.concurrency)
+
+        removed = {sku for _, sku, record in window if record is None}
+        for error in result.errors[errors_before:]:
+            failed[error.key] = error.key in removed
+
+        checkpoint = {
+            "snapshot": digest,
+            "position": window[-1][1],
+            "failed": failed,
+            "result": result.model_dump(mode="json"),
+        }
+        _replace(self.checkpoint_path, lambda f: json.dump(checkpoint, f))
+
+    def _commit(self, failed: dict[str, bool]):
+        """Make the applied snapshot the baseline of the next run
+
+        Rows that failed get an empty hash so the next run retries them; SKUs
+        that failed to deactivate are kept as tombstones.
+        """
+        tombstones = sorted([sku, 0, "", None] for sku, removed in failed.items() if removed)
+
+        def write(f):
+            for entry in heapq.merge(_read_entries(self.next_path), tombstones, key=lambda entry: entry[0]):
+                sku, index, row_hash, record = entry
+                if record is not None:
+                    entry = [sku, index, "" if sku in failed else row_hash, {}]
+                _write_entry(f, entry)
+
+        _replace(self.snapshot_path, write)
+        self.next_path.unlink()
+        self.checkpoint_path.unlink(missing_ok=True)
+
+    def _load_checkpoint(self) -> dict[str, Any] | None:
+        if not self.checkpoint_path.exists():
+            return None
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                return json.load(f)
+        except ValueError:
+            logger.warning("Ignoring unreadable supplier sync checkpoint")
+            return None
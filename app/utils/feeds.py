@@ -0,0 +1,158 @@
+import asyncio
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from pathlib import Path
+from typing import Any
+
+FEED_FORMATS = ("json", "ndjson", "csv")
+
+_CONTENT_TYPES = {
+    "application/json": "json",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+
+def detect_format(content_type: str | None = None, filename: str | None = None) -> str | None:
+    """Guess a feed format from a content type or file extension"""
+    if content_type:
+        fmt = _CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+        if fmt:
+            return fmt
+    if filename:
+        suffix = Path(filename).suffix.lower().lstrip(".")
+        if suffix == "jsonl":
+            return "ndjson"
+        if suffix in FEED_FORMATS:
+            return suffix
+    return None
+
+
+async def iter_file_chunks(path: str | Path, chunk_size: int = 1024 * 1024) -> AsyncIterator[bytes]:
+    """Read a file in chunks as an async byte stream
+
+    Opening, reading and closing run in worker threads so disk I/O never blocks the event loop.
+    """
+    f = await asyncio.to_thread(open, path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(f.read, chunk_size):
+            yield chunk
+    finally:
+        await asyncio.to_thread(f.close)
+
+
+async def _iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+
+def _parse_csv_row(header: list[str], record: str) -> dict[str, Any]:
+    values = next(csv.reader([record]))
+    # Empty cells mean "not provided" so model defaults apply
+    row = {key: value for key, value in zip(header, values) if value != ""}
+    if isinstance(row.get("attributes"), str):
+        row["attributes"] = json.loads(row["attributes"])
+    return row
+
+
+async def iter_records(chunks: AsyncIterable[bytes], fmt: str) -> AsyncIterator[dict[str, Any] | Exception]:
+    """Stream records from a JSON array, NDJSON or CSV byte stream
+
+    NDJSON and CSV are parsed incrementally so memory stays bounded; a JSON array
+    has to be read whole. Rows that cannot be parsed are yielded as the exception
+    so callers can report them by position and carry on.
+    """
+    if fmt == "json":
+        body = b"".join([chunk async for chunk in chunks])
+        data = json.loads(body or b"[]")
+        for item in data if isinstance(data, list) else [data]:
+            yield item if isinstance(item, dict) else ValueError("Expected a JSON object")
+        return
+
+    if fmt == "ndjson":
+        async for line in _iter_lines(chunks):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                yield e
+                continue
+            yield item if isinstance(item, dict) else ValueError("Expected a JSON object")
+        return
+
+    if fmt == "csv":
+        header = None
+        record = ""
+        async for line in _iter_lines(chunks):
+            record = f"{record}\n{line}" if record else line
+            # A quoted field may contain newlines; wait until the quotes balance
+            if record.count('"') % 2:
+                continue
+            if header is None:
+                header = next(csv.reader([record]))
+            elif record.strip():
+                try:
+                    yield _parse_csv_row(header, record)
+                except (csv.Error, ValueError) as e:
+                    yield e
+            record = ""
+        return
+
+    raise ValueError(f"Unsupported feed format: {fmt}")
+
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Flush streamed output once this many bytes are buffered
+_EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+async def iter_export(
+    records: AsyncIterable[dict[str, Any]],
+    fmt: str,
+    fieldnames: list[str] | None = None,
+) -> AsyncIterator[bytes]:
+    """Serialize a record stream to NDJSON or CSV bytes in bounded chunks
+
+    CSV uses fieldnames as its header; nested values are written as JSON.
+    """
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    buffer = io.StringIO()
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+
+    async for record in records:
+        if writer is not None:
+            writer.writerow({key: _csv_value(value) for key, value in record.items()})
+        else:
+            buffer.write(json.dumps(record, default=str))
+            buffer.write("\n")
+
+        if buffer.tell() >= _EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
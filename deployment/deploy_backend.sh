@@ -59,6 +59,9 @@ WEAVIATE_HOST=localhost
 WEAVIATE_PORT=8080
 WEAVIATE_SCHEME=http
 
+# Query vector cache (t2v-transformers port published by setup_weaviate.sh)
+TRANSFORMERS_INFERENCE_URL=http://localhost:9090
+
 # CORS - Update with your frontend domains
 CORS_ORIGINS=["http://localhost:3000","http://localhost:3001","http://localhost:8000"]
 
@@ -42,7 +42,7 @@ cat > /tmp/weaviate-docker-compose.yml << 'EOF'
 version: '3.4'
 services:
   weaviate:
-    image: semitechnologies/weaviate:1.24.10
+    image: semitechnologies/weaviate:1.26.1
     container_name: weaviate
     restart: unless-stopped
     ports:
@@ -63,6 +63,8 @@ services:
     image: semitechnologies/transformers-inference:sentence-transformers-multi-qa-MiniLM-L6-cos-v1
     container_name: weaviate-transformers
     restart: unless-stopped
+    ports:
+      - "127.0.0.1:9090:8080"
     environment:
       ENABLE_CUDA: '0'
 
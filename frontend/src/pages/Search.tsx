@@ -27,7 +27,7 @@ const Search = () => {
     setSearched(true);
     try {
       const response = await productsAPI.search(searchQuery);
-      setProducts(response.data);
+      setProducts(response.data.data.map((hit) => hit.item));
     } catch (error) {
       console.error('Search failed:', error);
       setProducts([]);
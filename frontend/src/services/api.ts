@@ -6,6 +6,7 @@ import {
   Product,
   Order,
   PaginatedResponse,
+  SearchResponse,
 } from '../types';
 
 const api = axios.create({
@@ -64,7 +65,7 @@ export const productsAPI = {
     api.get(`/products/by-section/${sectionId}`, { params }),
   getFeatured: (params?: QueryParams): Promise<AxiosResponse<PaginatedResponse<Product>>> =>
     api.get('/products/featured', { params }),
-  search: (query: string): Promise<AxiosResponse<Product[]>> =>
+  search: (query: string): Promise<AxiosResponse<SearchResponse<Product>>> =>
     api.get('/products/search', { params: { q: query } }),
 };
 
@@ -98,6 +98,19 @@ export interface PaginatedResponse<T> {
   page_size: number;
   total_pages: number;
   data: T[];
+  next_cursor?: string | null;
+}
+
+export interface SearchHit<T> {
+  score: number | null;
+  item: T;
+}
+
+export interface SearchResponse<T> {
+  limit: number;
+  offset: number;
+  data: SearchHit<T>[];
+  next_cursor?: string | null;
 }
 
 export interface CartItem extends Product {
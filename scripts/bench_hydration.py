@@ -0,0 +1,120 @@
+"""Benchmark per-row hydration cost of list pages
+
+Compares the previous per-service conversion (UUID comprehension, json.loads and
+full Pydantic validation) with the precompiled RowMapper on synthetic 100-row
+pages. No Weaviate connection is needed.
+"""
+import json
+import sys
+import timeit
+import uuid
+from types import SimpleNamespace
+
+sys.path.insert(0, ".")
+
+from app.db.mappers import order_mapper, product_mapper
+from app.models.order import Order
+from app.models.product import Product
+
+PAGE_SIZE = 100
+REPEAT = 200
+
+
+def make_products() -> list:
+    return [
+        SimpleNamespace(
+            uuid=uuid.uuid4(),
+            properties={
+                "name": f"Product {i}",
+                "description": "A reasonably long product description " * 5,
+                "price": 100.0 + i,
+                "compare_at_price": 120.0 + i,
+                "cost": 60.0,
+                "category_id": str(uuid.uuid4()),
+                "section_id": str(uuid.uuid4()),
+                "sku": f"SKU-{i:05d}",
+                "inventory_quantity": i,
+                "image_url": f"https://example.com/{i}.jpg",
+                "is_active": True,
+                "featured": i % 5 == 0,
+                "discount_percentage": 10.0,
+                "attributes_json": json.dumps({"color": "black", "storage": "256GB", "weight": i}),
+                "slug": f"product-{i}",
+                "created_at": "2024-01-01T00:00:00",
+                "updated_at": "2024-01-01T00:00:00",
+            },
+        )
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def make_orders() -> list:
+    items = [
+        {"product_id": str(uuid.uuid4()), "product_name": f"Item {j}", "quantity": 2, "price": 10.0, "subtotal": 20.0}
+        for j in range(3)
+    ]
+    return [
+        SimpleNamespace(
+            uuid=uuid.uuid4(),
+            properties={
+                "order_number": f"ORD-20240101-{i:06d}",
+                "customer_name": "Jane Doe",
+                "customer_email": "jane@example.com",
+                "customer_phone": "+1-555-0100",
+                "shipping_address": "1 Main Street, Springfield",
+                "billing_address": "1 Main Street, Springfield",
+                "items_json": json.dumps(items),
+                "subtotal": 60.0,
+                "tax": 6.0,
+                "shipping_cost": 5.0,
+                "total": 71.0,
+                "status": "pending",
+                "notes": None,
+                "created_at": "2024-01-01T00:00:00",
+                "updated_at": "2024-01-01T00:00:00",
+            },
+        )
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def legacy_products(objects) -> list:
+    products = []
+    for obj in objects:
+        props = {k: str(v) if hasattr(v, "hex") else v for k, v in obj.properties.items()}
+        if "attributes_json" in props:
+            props["attributes"] = json.loads(props.pop("attributes_json"))
+        products.append(Product(id=str(obj.uuid), **props))
+    return products
+
+
+def legacy_orders(objects) -> list:
+    orders = []
+    for obj in objects:
+        props = dict(obj.properties)
+        if "items_json" in props:
+            props["items"] = json.loads(props.pop("items_json"))
+        orders.append(Order(id=str(obj.uuid), **props))
+    return orders
+
+
+def per_row_us(func, objects) -> float:
+    seconds = min(timeit.repeat(lambda: func(objects), number=REPEAT, repeat=5))
+    return seconds / REPEAT / len(objects) * 1e6
+
+
+def main():
+    cases = [
+        ("Product", make_products(), legacy_products, lambda objs: [product_mapper.from_object(o) for o in objs]),
+        ("Order", make_orders(), legacy_orders, lambda objs: [order_mapper.from_object(o) for o in objs]),
+    ]
+    print(f"Per-row hydration cost on {PAGE_SIZE}-row pages (best of 5 x {REPEAT} pages)")
+    print(f"{'collection':<12}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name, objects, legacy, mapped in cases:
+        before = per_row_us(legacy, objects)
+        after = per_row_us(mapped, objects)
+        print(f"{name:<12}{before:>14.2f}{after:>14.2f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark single-product update and delete latency against Weaviate
+
+Compares the previous request path (fetch, update, fetch again for updates;
+fetch, then delete for deletes) with the current ProductService methods. Each
+update path writes a price the products do not have yet; the no-op row times
+an update that matches the stored content and is skipped.
+Needs the Weaviate instance from the settings; the scratch products it creates
+are deleted again.
+"""
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, ".")
+
+from app.db.weaviate_client import async_weaviate_client
+from app.models.product import ProductUpdate
+from app.services.product_service import ProductService
+
+SAMPLES = 200
+
+
+def summary(name: str, timings: list[float]) -> str:
+    timings = sorted(t * 1000 for t in timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    return (
+        f"{name:<22}{statistics.mean(timings):>10.2f}"
+        f"{statistics.median(timings):>10.2f}{p95:>10.2f}"
+    )
+
+
+async def timed(func, ids: list[str]) -> list[float]:
+    timings = []
+    for product_id in ids:
+        start = time.perf_counter()
+        await func(product_id)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def main():
+    client = await async_weaviate_client.connect()
+    service = ProductService(client)
+    collection = service.collection
+    now = datetime.utcnow().isoformat()
+
+    async def scratch(count: int) -> list[str]:
+        return [
+            str(await collection.data.insert(properties={
+                "name": f"Write benchmark {i}", "price": 1.0, "is_active": False,
+                "created_at": now, "updated_at": now,
+            }))
+            for i in range(count)
+        ]
+
+    async def legacy_update(product_id: str):
+        await collection.query.fetch_object_by_id(product_id)
+        await collection.data.update(uuid=product_id, properties={"price": 2.0, "updated_at": now})
+        await collection.query.fetch_object_by_id(product_id)
+
+    async def legacy_delete(product_id: str):
+        await collection.query.fetch_object_by_id(product_id)
+        await collection.data.delete_by_id(product_id)
+
+    # The legacy path leaves price 2.0, so this one is a real write
+    patch = ProductUpdate(price=3.0)
+    try:
+        ids = await scratch(SAMPLES)
+        results = [
+            summary("update (before)", await timed(legacy_update, ids)),
+            summary("update (after)", await timed(lambda i: service.update_product(i, patch), ids)),
+            summary("update (no-op)", await timed(lambda i: service.update_product(i, patch), ids)),
+            summary("delete (before)", await timed(legacy_delete, ids[: SAMPLES // 2])),
+            summary("delete (after)", await timed(service.delete_product, ids[SAMPLES // 2 :])),
+        ]
+    finally:
+        await async_weaviate_client.close()
+
+    print(f"Latency over {SAMPLES} updates and {SAMPLES // 2} deletes per path (ms)")
+    print(f"{'operation':<22}{'mean':>10}{'p50':>10}{'p95':>10}")
+    for line in results:
+        print(line)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+"""Bulk import products from a JSON, NDJSON or CSV file"""
+import argparse
+import asyncio
+import sys
+
+sys.path.insert(0, ".")
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.weaviate_client import async_weaviate_client
+from app.services.product_service import ProductService
+from app.utils.feeds import FEED_FORMATS, detect_format, iter_file_chunks, iter_records
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+async def import_products(path: str, fmt: str, batch_size: int, concurrency: int) -> int:
+    """Stream a product file into Weaviate"""
+    client = await async_weaviate_client.connect()
+    try:
+        service = ProductService(client)
+        result = await service.bulk_upsert_products(
+            iter_records(iter_file_chunks(path), fmt),
+            batch_size=batch_size,
+            concurrency=concurrency,
+        )
+    finally:
+        await async_weaviate_client.close()
+
+    logger.info(
+        f"Imported {result.total} rows: {result.created} created, "
+        f"{result.updated} updated, {result.unchanged} unchanged, {result.failed} failed",
+    )
+    for error in result.errors:
+        logger.warning(f"Row {error.index} ({error.key or 'no sku'}): {error.message}")
+    return 1 if result.failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="Product feed file")
+    parser.add_argument("--format", choices=FEED_FORMATS, help="Feed format (default: from file extension)")
+    parser.add_argument("--batch-size", type=int, default=settings.BULK_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=settings.BULK_CONCURRENCY)
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(filename=args.path)
+    if fmt is None:
+        parser.error("Cannot infer feed format from file name; pass --format")
+
+    sys.exit(asyncio.run(import_products(args.path, fmt, args.batch_size, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
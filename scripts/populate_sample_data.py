@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 """Script to populate sample ecommerce data"""
 
+import asyncio
 import json
-from app.db.weaviate_client import weaviate_client
+from app.db.weaviate_client import async_weaviate_client
 from app.services.section_service import SectionService
 from app.services.category_service import CategoryService
 from app.services.product_service import ProductService
@@ -10,10 +11,10 @@ from app.services.site_config_service import SiteConfigService
 from app.models.site_config import SiteConfigUpdate
 
 
-def populate_sample_data():
+async def populate_sample_data():
     """Populate database with sample ecommerce data"""
     
-    client = weaviate_client.connect()
+    client = await async_weaviate_client.connect()
     
     # Initialize services
     section_service = SectionService(client)
@@ -44,7 +45,7 @@ def populate_sample_data():
         banner_link="/shop",
         banner_color="#7c3aed"
     )
-    site_config_service.update_config(config_update)
+    await site_config_service.update_config(config_update)
     print("✅ Site config updated")
     
     # Create sections
@@ -59,7 +60,7 @@ def populate_sample_data():
     sections = {}
     for sec_data in sections_data:
         from app.models.section import SectionCreate
-        section = section_service.create_section(SectionCreate(**sec_data))
+        section = await section_service.create_section(SectionCreate(**sec_data))
         sections[sec_data["name"]] = section
         print(f"  ✓ Created section: {sec_data['name']}")
     
@@ -78,7 +79,7 @@ def populate_sample_data():
     for cat_data in categories_data:
         from app.models.category import CategoryCreate
         section_id = sections[cat_data["section_name"]].id
-        category = category_service.create_category(CategoryCreate(
+        category = await category_service.create_category(CategoryCreate(
             name=cat_data["name"],
             description=cat_data["description"],
             section_id=section_id,
@@ -231,18 +232,13 @@ def populate_sample_data():
         },
     ]
     
-    from app.models.product import ProductCreate
-    for prod_data in products_data:
-        category_name = prod_data.pop("category")
-        category = categories[category_name]
-        section_id = category.section_id
-        
-        product = product_service.create_product(ProductCreate(
-            **prod_data,
-            category_id=category.id,
-            section_id=section_id
-        ))
-        print(f"  ✓ Created product: {prod_data['name']}")
+    async def product_records():
+        for prod_data in products_data:
+            category = categories[prod_data.pop("category")]
+            yield {**prod_data, "category_id": category.id, "section_id": category.section_id}
+
+    result = await product_service.bulk_upsert_products(product_records())
+    print(f"  ✓ Imported products: {result.created} created, {result.updated} updated, {result.failed} failed")
     
     print("\n✨ Sample data population complete!")
     print(f"   • {len(sections)} sections")
@@ -250,8 +246,8 @@ def populate_sample_data():
     print(f"   • {len(products_data)} products")
     print("\n🌐 Visit http://localhost:3001 to see your store!")
     
-    weaviate_client.close()
+    await async_weaviate_client.close()
 
 
 if __name__ == "__main__":
-    populate_sample_data()
+    asyncio.run(populate_sample_data())
@@ -1,28 +1,30 @@
 """Seed database with sample data"""
+import asyncio
 import sys
 
 sys.path.insert(0, ".")
 
 from app.core.logging import get_logger
-from app.db.weaviate_client import weaviate_client
+from app.db.weaviate_client import async_weaviate_client
 from app.models.category import CategoryCreate
 from app.models.order import OrderCreate, OrderItem
 from app.models.product import ProductCreate
 from app.models.section import SectionCreate
 from app.services.category_service import CategoryService
 from app.services.order_service import OrderService
+from app.services.order_stats import order_stats_store
 from app.services.product_service import ProductService
 from app.services.section_service import SectionService
 
 logger = get_logger(__name__)
 
 
-def seed_data():
+async def seed_data():
     """Seed database with sample data"""
     logger.info("Seeding database with sample data...")
 
     try:
-        client = weaviate_client.connect()
+        client = await async_weaviate_client.connect()
 
         # Create services
         section_service = SectionService(client)
@@ -32,14 +34,14 @@ def seed_data():
 
         # Create sections
         logger.info("Creating sections...")
-        section1 = section_service.create_section(SectionCreate(
+        section1 = await section_service.create_section(SectionCreate(
             title="Home Page",
             description="Main landing page section",
             order=1,
             is_active=True,
         ))
 
-        section2 = section_service.create_section(SectionCreate(
+        section2 = await section_service.create_section(SectionCreate(
             title="Featured Products",
             description="Showcase featured products",
             order=2,
@@ -49,14 +51,14 @@ def seed_data():
 
         # Create categories
         logger.info("Creating categories...")
-        electronics = category_service.create_category(CategoryCreate(
+        electronics = await category_service.create_category(CategoryCreate(
             name="Electronics",
             description="Electronic devices and gadgets",
             order=1,
             is_active=True,
         ))
 
-        phones = category_service.create_category(CategoryCreate(
+        phones = await category_service.create_category(CategoryCreate(
             name="Smartphones",
             description="Mobile phones and accessories",
             parent_category_id=electronics.id,
@@ -64,7 +66,7 @@ def seed_data():
             is_active=True,
         ))
 
-        clothing = category_service.create_category(CategoryCreate(
+        clothing = await category_service.create_category(CategoryCreate(
             name="Clothing",
             description="Apparel and fashion",
             order=2,
@@ -73,7 +75,7 @@ def seed_data():
 
         # Create products
         logger.info("Creating products...")
-        product1 = product_service.create_product(ProductCreate(
+        product1 = await product_service.create_product(ProductCreate(
             name="iPhone 15 Pro",
             description="Latest iPhone with advanced features",
             price=999.99,
@@ -88,7 +90,7 @@ def seed_data():
             attributes={"color": "Titanium Blue", "storage": "256GB"},
         ))
 
-        product2 = product_service.create_product(ProductCreate(
+        product2 = await product_service.create_product(ProductCreate(
             name="Samsung Galaxy S24",
             description="Powerful Android smartphone",
             price=899.99,
@@ -103,7 +105,7 @@ def seed_data():
             attributes={"color": "Phantom Black", "storage": "128GB"},
         ))
 
-        product3 = product_service.create_product(ProductCreate(
+        product3 = await product_service.create_product(ProductCreate(
             name="Classic T-Shirt",
             description="Comfortable cotton t-shirt",
             price=29.99,
@@ -118,7 +120,7 @@ def seed_data():
 
         # Create sample order
         logger.info("Creating sample orders...")
-        order1 = order_service.create_order(OrderCreate(
+        order1 = await order_service.create_order(OrderCreate(
             customer_name="John Doe",
             customer_email="john.doe@example.com",
             customer_phone="+1-555-1234",
@@ -153,6 +155,7 @@ def seed_data():
         logger.info(f"Created categories: {electronics.id}, {phones.id}, {clothing.id}")
         logger.info(f"Created products: {product1.id}, {product2.id}, {product3.id}")
         logger.info(f"Created order: {order1.order_number}")
+        await order_stats_store.flush(client)
 
     except Exception as e:
         logger.error(f"Failed to seed data: {e}")
@@ -160,8 +163,8 @@ def seed_data():
         traceback.print_exc()
         sys.exit(1)
     finally:
-        weaviate_client.close()
+        await async_weaviate_client.close()
 
 
 if __name__ == "__main__":
-    seed_data()
+    asyncio.run(seed_data())
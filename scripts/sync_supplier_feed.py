@@ -0,0 +1,72 @@
+"""Sync the catalog with a full supplier feed, writing only what changed since the last feed"""
+import argparse
+import asyncio
+import sys
+
+sys.path.insert(0, ".")
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.db.weaviate_client import async_weaviate_client
+from app.services.product_service import ProductService
+from app.services.supplier_sync import SupplierFeedSync
+from app.utils.feeds import FEED_FORMATS, detect_format, iter_file_chunks, iter_records
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+async def sync_feed(
+    path: str,
+    fmt: str,
+    state_dir: str,
+    batch_size: int,
+    concurrency: int,
+    allow_mass_deactivation: bool,
+) -> int:
+    """Diff a supplier feed against the previous one and apply the changes"""
+    client = await async_weaviate_client.connect()
+    try:
+        sync = SupplierFeedSync(ProductService(client), state_dir, batch_size, concurrency)
+        result = await sync.run(iter_records(iter_file_chunks(path), fmt), allow_mass_deactivation)
+    except ValueError as e:
+        logger.error(f"Supplier sync aborted: {e}")
+        return 1
+    finally:
+        await async_weaviate_client.close()
+
+    logger.info(
+        f"Synced {result.total} rows{' (resumed)' if result.resumed else ''}: "
+        f"{result.created} created, {result.updated} updated, {result.deactivated} deactivated, "
+        f"{result.unchanged} unchanged, {result.failed} failed",
+    )
+    for error in result.errors:
+        logger.warning(f"Row {error.index or '-'} ({error.key or 'no sku'}): {error.message}")
+    return 1 if result.failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="Supplier feed file")
+    parser.add_argument("--format", choices=FEED_FORMATS, help="Feed format (default: from file extension)")
+    parser.add_argument("--state-dir", default=settings.SUPPLIER_SYNC_STATE_DIR)
+    parser.add_argument("--batch-size", type=int, default=settings.BULK_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=settings.BULK_CONCURRENCY)
+    parser.add_argument(
+        "--allow-mass-deactivation",
+        action="store_true",
+        help="Apply the feed even if it drops more SKUs than SUPPLIER_SYNC_MAX_DEACTIVATE_RATIO allows",
+    )
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(filename=args.path)
+    if fmt is None:
+        parser.error("Cannot infer feed format from file name; pass --format")
+
+    sys.exit(asyncio.run(sync_feed(
+        args.path, fmt, args.state_dir, args.batch_size, args.concurrency, args.allow_mass_deactivation,
+    )))
+
+
+if __name__ == "__main__":
+    main()
@@ -245,9 +245,9 @@ class APITester:
             response = await client.get(f"{BASE_URL}/products/search?q=test&limit=5")
             assert response.status_code == 200, f"Expected 200, got {response.status_code}"
             data = response.json()
-            assert isinstance(data, list), "Expected list response"
+            assert isinstance(data.get("data"), list), "Expected search response"
             self.log_success("/products/search", "GET")
-            self.log(f"  Found {len(data)} products", "BLUE")
+            self.log(f"  Found {len(data['data'])} products", "BLUE")
         except Exception as e:
             self.log_error("/products/search", "GET", str(e))
 
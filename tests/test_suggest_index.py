@@ -0,0 +1,117 @@
+import random
+
+import pytest
+
+from app.services import suggest_index as suggest_module
+from app.services.suggest_index import SuggestIndex, _SortedTerms
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    # Tiny blocks so a few dozen terms exercise splits and emptied blocks
+    monkeypatch.setattr(suggest_module, "BLOCK_SIZE", 4)
+
+
+def texts(suggestions) -> list[str]:
+    return [suggestion.text for suggestion in suggestions]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sorted_terms_match_sorted_set_under_random_writes(seed):
+    rng = random.Random(seed)
+    universe = [(f"term{i:03d}", rng.choice(["name", "sku"]), str(i % 7)) for i in range(200)]
+    expected = set(rng.sample(universe, 20))
+    terms = _SortedTerms(expected)
+
+    for _ in range(2000):
+        term = rng.choice(universe)
+        if rng.random() < 0.55:
+            if term not in expected:
+                expected.add(term)
+                terms.add(term)
+        else:
+            expected.discard(term)
+            terms.discard(term)
+
+        assert len(terms) == len(expected)
+        probe = rng.choice(universe)
+        assert list(terms.iter_from(probe)) == [item for item in sorted(expected) if item >= probe]
+
+    assert list(terms) == sorted(expected)
+
+
+def test_sorted_terms_drain_to_empty_and_refill():
+    terms = _SortedTerms((f"t{i:02d}", "name", "1") for i in range(20))
+    for i in range(20):
+        terms.discard((f"t{i:02d}", "name", "1"))
+
+    assert len(terms) == 0 and list(terms) == []
+    assert list(terms.iter_from(("",))) == []
+
+    terms.add(("a", "sku", "2"))
+
+    assert list(terms) == [("a", "sku", "2")]
+
+
+def test_search_matches_name_words_sku_and_category():
+    index = SuggestIndex()
+    index.set_product("p1", "Apple iPhone 15 Pro", "APL-15P")
+    index.set_product("p2", "Pixel Pro Fold", "GOO-PF")
+    index.set_category("c1", "Phones")
+
+    assert texts(index.search("iphone")) == ["Apple iPhone 15 Pro"]
+    assert {s.id for s in index.search("PRO")} == {"p1", "p2"}
+    assert [(s.kind, s.id) for s in index.search("apl")] == [("sku", "p1")]
+    assert [(s.kind, s.id) for s in index.search("pho")] == [("category", "c1")]
+    assert index.search("  ") == []
+    assert index.search("zzz") == []
+
+
+def test_search_lists_a_product_once_and_respects_limit():
+    index = SuggestIndex()
+    index.set_product("p1", "Pro Pro Max", "PRO-1")
+    for i in range(5):
+        index.set_product(f"q{i}", f"Probe {i}", None)
+
+    assert [(s.kind, s.id) for s in index.search("pro pro")] == [("name", "p1")]
+    assert len(index.search("pro", limit=3)) == 3
+
+
+def test_set_product_replaces_old_terms_and_drops_inactive():
+    index = SuggestIndex()
+    index.set_product("p1", "Old Name", "SKU-OLD")
+
+    index.set_product("p1", "New Name", "SKU-NEW")
+
+    assert index.search("old") == []
+    assert index.search("sku-old") == []
+    assert texts(index.search("new")) == ["New Name"]
+    assert texts(index.search("sku-new")) == ["SKU-NEW"]
+
+    index.set_product("p1", "New Name", "SKU-NEW", is_active=False)
+
+    assert index.search("new") == [] and len(index) == 0
+
+
+def test_remove_products_drops_only_those_products():
+    index = SuggestIndex()
+    index.set_products((f"p{i}", f"Widget {i}", f"W-{i}", True) for i in range(30))
+
+    index.remove_products(f"p{i}" for i in range(0, 30, 2))
+
+    remaining = {s.id for s in index.search("widget", limit=100)}
+    assert remaining == {f"p{i}" for i in range(1, 30, 2)}
+    assert {s.id for s in index.search("w-", limit=100)} == remaining
+    assert len(index) == 2 * len(remaining)
+
+
+def test_single_writes_and_bulk_writes_build_the_same_index():
+    products = [(f"p{i}", f"Item {i} Deluxe", f"SKU{i}", i % 5 != 0) for i in range(40)]
+    one_by_one = SuggestIndex()
+    for product in products:
+        one_by_one.set_product(*product)
+    bulk = SuggestIndex()
+    bulk.set_products(products)
+
+    assert list(one_by_one._terms) == list(bulk._terms)
+    assert one_by_one.search("item", limit=100) == bulk.search("item", limit=100)
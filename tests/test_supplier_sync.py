@@ -0,0 +1,197 @@
+import asyncio
+
+import pytest
+
+from app.models.common import BulkItemError
+from app.services.supplier_sync import SupplierFeedSync
+
+
+class StubProductService:
+    """Records what a sync writes, keyed by SKU, in place of Weaviate"""
+
+    def __init__(self):
+        self.products: dict[str, dict] = {}
+        self.calls: list[list[tuple]] = []
+        self.fail_skus: set[str] = set()
+        # Raise instead of writing once this many windows have been applied
+        self.crash_after: int | None = None
+
+    async def sync_products_by_sku(self, changes, result, batch_size=200, concurrency=4):
+        if self.crash_after is not None and len(self.calls) >= self.crash_after:
+            raise RuntimeError("connection lost")
+        self.calls.append(list(changes))
+        for index, sku, record in changes:
+            if sku in self.fail_skus:
+                result.failed += 1
+                result.errors.append(BulkItemError(index=index, key=sku, message="write failed"))
+                continue
+            product = self.products.get(sku)
+            if record is None:
+                if product is None or not product["is_active"]:
+                    result.unchanged += 1
+                else:
+                    product["is_active"] = False
+                    result.deactivated += 1
+            elif product is None:
+                self.products[sku] = {"is_active": True, **record}
+                result.created += 1
+            else:
+                product.update(record)
+                result.updated += 1
+
+    def written(self) -> list[str]:
+        return [sku for window in self.calls for _, sku, _ in window]
+
+
+def feed(count: int, price: float = 1.0) -> list[dict]:
+    return [{"sku": f"SKU{i:03d}", "name": f"Item {i}", "price": price} for i in range(count)]
+
+
+async def _records(rows):
+    for row in rows:
+        yield row
+
+
+@pytest.fixture
+def service():
+    return StubProductService()
+
+
+@pytest.fixture
+def sync(service, tmp_path):
+    def run(rows, max_deactivate_ratio=1.0, **kwargs):
+        syncer = SupplierFeedSync(
+            service, tmp_path, batch_size=2, concurrency=2, sort_run_size=3,
+            max_deactivate_ratio=max_deactivate_ratio,
+        )
+        return asyncio.run(syncer.run(_records(rows), **kwargs))
+    return run
+
+
+def test_first_sync_creates_every_row(sync, service):
+    result = sync(list(reversed(feed(10))))
+
+    assert result.created == 10
+    assert service.written() == sorted(service.written())
+
+
+def test_unchanged_feed_writes_nothing(sync, service):
+    sync(feed(10))
+    service.calls.clear()
+
+    result = sync(feed(10))
+
+    assert result.unchanged == 10
+    assert service.calls == []
+
+
+def test_only_changed_added_and_dropped_rows_are_written(sync, service):
+    sync(feed(10))
+    service.calls.clear()
+    rows = feed(10)
+    rows[3]["price"] = 9.0
+    del rows[5]
+    rows.append({"sku": "SKU100", "name": "New", "price": 1.0})
+
+    result = sync(rows)
+
+    assert (result.created, result.updated, result.deactivated, result.unchanged) == (1, 1, 1, 8)
+    assert service.written() == ["SKU003", "SKU005", "SKU100"]
+    assert service.products["SKU003"]["price"] == 9.0
+    assert service.products["SKU005"]["is_active"] is False
+
+
+def test_last_row_wins_for_a_repeated_sku(sync, service):
+    rows = feed(3) + [{"sku": "SKU001", "name": "Renamed", "price": 2.0}]
+
+    result = sync(rows)
+
+    assert result.created == 3
+    assert service.products["SKU001"]["name"] == "Renamed"
+
+
+def test_returning_sku_is_reactivated(sync, service):
+    sync(feed(10))
+    sync(feed(9))
+    assert service.products["SKU009"]["is_active"] is False
+
+    sync(feed(10))
+
+    assert service.products["SKU009"]["is_active"] is True
+
+
+def test_interrupted_sync_resumes_after_checkpoint(sync, service, tmp_path):
+    sync(feed(10))
+    service.crash_after = len(service.calls) + 1
+    with pytest.raises(RuntimeError):
+        sync(feed(10, price=2.0))
+    assert (tmp_path / "checkpoint.json").exists()
+    applied = {sku for _, sku, _ in service.calls[-1]}
+    windows_before = len(service.calls)
+    service.crash_after = None
+
+    result = sync(feed(10, price=2.0))
+
+    assert result.resumed
+    assert result.updated == 10
+    resumed = {sku for window in service.calls[windows_before:] for _, sku, _ in window}
+    assert applied and not applied & resumed
+    assert applied | resumed == set(service.products)
+    assert all(product["price"] == 2.0 for product in service.products.values())
+    assert not (tmp_path / "checkpoint.json").exists()
+
+
+def test_failed_rows_are_retried_next_run(sync, service):
+    service.fail_skus = {"SKU002"}
+
+    result = sync(feed(5))
+
+    assert result.failed == 1 and result.errors[0].key == "SKU002"
+    service.fail_skus = set()
+    service.calls.clear()
+
+    result = sync(feed(5))
+
+    assert result.created == 1 and result.unchanged == 4
+    assert service.written() == ["SKU002"]
+
+
+def test_failed_deactivation_is_kept_as_tombstone(sync, service):
+    sync(feed(5))
+    service.fail_skus = {"SKU004"}
+
+    sync(feed(4))
+
+    assert service.products["SKU004"]["is_active"] is True
+    service.fail_skus = set()
+    service.calls.clear()
+
+    result = sync(feed(4))
+
+    assert service.written() == ["SKU004"]
+    assert result.deactivated == 1
+    assert service.products["SKU004"]["is_active"] is False
+
+
+def test_empty_feed_is_refused(sync, service, tmp_path):
+    sync(feed(5))
+    service.calls.clear()
+
+    with pytest.raises(ValueError):
+        sync([{"name": "no sku"}])
+
+    assert service.calls == []
+    assert not (tmp_path / "snapshot.next.ndjson").exists()
+
+
+def test_mass_deactivation_needs_override(sync, service):
+    sync(feed(10))
+    service.calls.clear()
+
+    with pytest.raises(ValueError, match="drops 5 of 10"):
+        sync(feed(5), max_deactivate_ratio=0.2)
+    assert service.calls == []
+
+    result = sync(feed(5), max_deactivate_ratio=0.2, allow_mass_deactivation=True)
+
+    assert result.deactivated == 5